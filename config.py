@@ -6,6 +6,7 @@ file type definitions, and operational limits.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -16,48 +17,136 @@ class Config:
     SERVER_NAME = "filesystem-explorer"
     
     # Path configuration
-    STORAGE_PATH = os.path.join(os.getcwd(), "storage")
+    STORAGE_DIR_NAME = "storage"  # Resolved against the working directory by storage_path()
     UPLOADED_FILES_PATH = "/home/piyush/.local/lib/python3.12/site-packages/open_webui/data/uploads/"
     
+    # Upload synchronization
+    SYNC_DEBOUNCE_SECONDS = 0.2  # Quiet time after a file's last event before it is copied
+    SYNC_IGNORE_SUFFIXES = frozenset(['.part', '.partial', '.tmp', '.crdownload', '.swp'])  # Temp files never synced
+    SYNC_IGNORE_NAMES = frozenset(['.DS_Store', 'Thumbs.db', 'desktop.ini', '__MACOSX'])  # OS metadata files and directories never synced
+    SYNC_ALLOWED_SUFFIXES = None  # Set of lowercase suffixes (e.g. {'.pdf', '.md'}) to sync only those types; None syncs all
+    SYNC_QUEUE_MAX = 1024  # Pending syncs before event handling waits for the sync worker
+    
     # Logging configuration
     LOG_FILE = "mcp_server.log"
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+    LOG_MAX_BYTES = 10_000_000  # LOG_FILE is rotated past this size
+    LOG_BACKUP_COUNT = 3  # Rotated log files kept
     
     # File type definitions
     IMAGE_EXTENSIONS = frozenset(['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.svg'])
     PDF_EXTENSION = '.pdf'
+    
+    # File kinds returned by classify_file()
+    FILE_KIND_TEXT = 'text'
+    FILE_KIND_PDF = 'pdf'
+    FILE_KIND_IMAGE = 'image'
+    
+    # Lowercase suffix (without the dot) -> file kind
+    _SUFFIX_KINDS = dict.fromkeys((ext.lstrip('.') for ext in IMAGE_EXTENSIONS), FILE_KIND_IMAGE)
+    _SUFFIX_KINDS[PDF_EXTENSION.lstrip('.')] = FILE_KIND_PDF
+    
     BINARY_CHECK_BYTES = 1024  # Number of bytes to read for binary detection
+    BINARY_NONTEXT_RATIO = 0.30  # Max share of non-text bytes in the sample before a file is binary
+    IMAGE_ENCODE_CHUNK_BYTES = 57 * 1024  # Read size for base64 encoding (multiple of 3)
+    MMAP_MIN_BYTES = 64 * 1024  # Files at least this large are memory-mapped instead of read()
+    
+    # PDF extraction
+    PDF_MAX_WORKERS = min(os.cpu_count() or 1, 8)  # Worker processes for page extraction
+    PDF_PARALLEL_MIN_PAGES = 4  # Smaller PDFs are extracted in-process
+    PDF_MIN_PAGES_PER_TASK = 10  # Lower bound on pages per worker task
+    PDF_PAGE_TIMEOUT = 10.0  # Seconds before a page's text extraction is abandoned, checked between operators (0 = no limit)
+    
+    # Repository cloning
+    CLONE_TIMEOUT_SECONDS = 300  # git clone is killed after this long
     
     # Directory traversal limits
     DEFAULT_MAX_DEPTH = 100
+    LIST_FILES_DEPTH = 2  # Default depth of the list_files tool
+    LISTING_MAX_ENTRIES = 50_000  # list_files stops descending past this many entries
+    LISTING_CACHE_MAX_DIRS = 4096  # Directory listings kept by build_files, keyed on mtime
+    LISTING_OUTPUT_CACHE_MAX = 16  # Formatted build_files outputs kept for unchanged trees
+    FILE_CACHE_MAX_FILES = 100_000  # File names remembered from listings (least recently listed dropped first)
+    IO_MAX_WORKERS = 8  # Threads for parallel directory listing and file reads
+    LISTING_PARALLEL_MIN_DIRS = 8  # Smaller tree levels are listed on the calling thread
+    
+    # VCS, tool and build output directories that listings, searches and
+    # read_latest_content do not descend into; they rarely hold content users
+    # ask for but can make up most of a tree's entries
+    SKIP_DIRS = frozenset({
+        '.git', '.github', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+        'dist', 'build', '.tox', '.mypy_cache', '.pytest_cache', 'target', '.idea'
+    })
     
     # File matching
     CASE_INSENSITIVE_MATCH = True
+    SEARCH_CACHE_TTL = 30.0  # Seconds a file/directory search result is reused
+    SEARCH_CACHE_MAX_ENTRIES = 1024
     
     # Encoding fallback chain
     ENCODING_PRIMARY = 'utf-8'
     ENCODING_FALLBACK = 'latin-1'
     
+    @classmethod
+    @lru_cache(maxsize=1)
+    def storage_path(cls) -> str:
+        """
+        Get the local storage directory.
+        
+        Resolved against the current working directory on first use rather
+        than at import time, then cached; see invalidate_paths().
+        
+        Returns:
+            Absolute path of the storage directory
+        """
+        return os.path.join(os.getcwd(), cls.STORAGE_DIR_NAME)
+    
     @classmethod
     def ensure_directories_exist(cls) -> None:
         """
         Ensure that all required directories exist.
         Creates them if they don't exist.
         """
-        Path(cls.STORAGE_PATH).mkdir(parents=True, exist_ok=True)
+        Path(cls.storage_path()).mkdir(parents=True, exist_ok=True)
     
     @classmethod
-    def get_search_paths(cls) -> list[str]:
+    @lru_cache(maxsize=1)
+    def get_search_paths(cls) -> tuple[str, ...]:
         """
         Get all paths that should be searched for files.
         
+        The result is computed once and cached; call invalidate_paths()
+        after changing any path configuration.
+        
         Returns:
-            List of directory paths to search
+            Tuple of directory paths to search
         """
         # Only search in local storage path
-        # Files from UPLOADED_FILES_PATH are synced to STORAGE_PATH
-        return [cls.STORAGE_PATH]
+        # Files from UPLOADED_FILES_PATH are synced to storage_path()
+        return (cls.storage_path(),)
+    
+    @classmethod
+    def invalidate_paths(cls) -> None:
+        """Clear cached path lookups so configuration changes take effect."""
+        cls.storage_path.cache_clear()
+        cls.get_search_paths.cache_clear()
+    
+    @classmethod
+    def classify_file(cls, filename: str) -> str:
+        """
+        Classify a file by its extension with a single table lookup.
+        
+        Args:
+            filename: Name or path of the file
+            
+        Returns:
+            One of FILE_KIND_IMAGE, FILE_KIND_PDF or FILE_KIND_TEXT
+        """
+        _, dot, suffix = filename.rpartition('.')
+        if not dot:
+            return cls.FILE_KIND_TEXT
+        return cls._SUFFIX_KINDS.get(suffix.lower(), cls.FILE_KIND_TEXT)
     
     @classmethod
     def is_image_file(cls, filename: str) -> bool:
@@ -70,7 +159,7 @@ class Config:
         Returns:
             True if the file is an image, False otherwise
         """
-        return any(filename.lower().endswith(ext) for ext in cls.IMAGE_EXTENSIONS)
+        return cls.classify_file(filename) == cls.FILE_KIND_IMAGE
     
     @classmethod
     def is_pdf_file(cls, filename: str) -> bool:
@@ -83,4 +172,4 @@ class Config:
         Returns:
             True if the file is a PDF, False otherwise
         """
-        return filename.lower().endswith(cls.PDF_EXTENSION)
+        return cls.classify_file(filename) == cls.FILE_KIND_PDF
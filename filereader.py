@@ -5,17 +5,384 @@ This module provides utilities for file operations including file existence
 checking and content reading with proper error handling.
 """
 
+import codecs
+import errno
+import io
 import os
+import mmap
 import logging
-from typing import Optional
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Iterable, Iterator, Optional, TextIO, TypeVar
 from pathlib import Path
-from exceptions import FileNotFoundError as CustomFileNotFoundError, FileReadError
+from exceptions import (
+    FileNotFoundError as CustomFileNotFoundError,
+    FileReadError,
+    InvalidFileTypeError
+)
 from config import Config
-import base64
-try:
+
+T = TypeVar("T")
+
+# Human-readable FileReadError reasons for common OSError errnos
+_ERRNO_REASONS = {
+    errno.ENOENT: "File does not exist",
+    errno.EACCES: "Permission denied",
+    errno.EPERM: "Permission denied",
+    errno.EISDIR: "Path is a directory",
+}
+
+# Bytes that commonly appear in text files (the classic file(1) heuristic);
+# deleting them from a sample leaves only the "non-text" bytes
+_TEXT_BYTES = bytes(
+    {7, 8, 9, 10, 12, 13, 27} | set(range(0x20, 0x7F)) | set(range(0x80, 0x100))
+)
+
+
+# Byte order marks and the codec that decodes (and strips) each one. UTF-32
+# marks are listed first because BOM_UTF32_LE starts with BOM_UTF16_LE.
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _bom_encoding(head: bytes) -> Optional[str]:
+    """Return the codec named by a leading byte order mark, if any."""
+    for bom, encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def _translate_newlines(text: str) -> str:
+    """Translate \\r\\n and \\r to \\n, as text-mode open() does."""
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+@dataclass(eq=False)
+class FileIndex:
+    """
+    Lowercased lookup index over a collection of file names.
+    
+    Names are stored struct-of-arrays style: ``names`` keeps the originals and
+    ``names_lower`` the pre-lowered forms at the same positions, so lookups
+    never lowercase candidates. The lowered names are also joined into one
+    NUL-separated buffer so a partial match is a single C-level ``str.find``
+    instead of a Python loop over every name. NUL cannot appear in file
+    names, so it never matches.
+    
+    Names may be ``str`` or ``bytes`` (e.g. from scandir_names_bytes()).
+    Bytes names are lowercased with ``bytes.lower()``, a plain ASCII table
+    lookup that skips Unicode case mapping; matching on them is therefore
+    case-insensitive for ASCII characters only.
+    """
+    
+    SEPARATOR: ClassVar[str] = "\x00"
+    # Distinct search terms whose find() result is kept per index
+    FIND_CACHE_MAX: ClassVar[int] = 1024
+    
+    names: tuple[str | bytes, ...]
+    names_lower: tuple[str | bytes, ...]
+    is_bytes: bool = field(init=False)
+    name_set: frozenset[str | bytes] = field(init=False, repr=False)
+    lower_to_name: dict[str | bytes, str | bytes] = field(init=False, repr=False)
+    separator: str | bytes = field(init=False, repr=False)
+    lower_haystack: str | bytes = field(init=False, repr=False)
+    _found: dict[str | bytes, Optional[str | bytes]] = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        self.is_bytes = bool(self.names) and isinstance(self.names[0], bytes)
+        self.name_set = frozenset(self.names)
+        # Built back to front so the first name wins when lowercased names collide
+        self.lower_to_name = dict(zip(reversed(self.names_lower), reversed(self.names)))
+        self.separator = self.SEPARATOR.encode() if self.is_bytes else self.SEPARATOR
+        self.lower_haystack = self.separator.join(self.names_lower)
+        self._found = {}
+    
+    @classmethod
+    def from_names(cls, files: Iterable[str] | Iterable[bytes]) -> "FileIndex":
+        """
+        Build an index, lowercasing each name once.
+        
+        Args:
+            files: File names to index
+            
+        Returns:
+            FileIndex over the given names
+        """
+        names = tuple(files)
+        return cls(names, tuple(name.lower() for name in names))
+    
+    def find(self, file_name_lower: str | bytes) -> Optional[str | bytes]:
+        """
+        Find the first indexed name containing the given lowercased term.
+        
+        Results, misses included, are memoized on the index: clients often
+        retry the same name after a miss, and the memo is freed together
+        with the index once a newer listing replaces it.
+        
+        Args:
+            file_name_lower: Lowercased search term
+            
+        Returns:
+            The original (non-lowercased) matching name, or None
+        """
+        if not self.names:
+            return None
+        
+        try:
+            return self._found[file_name_lower]
+        except KeyError:
+            pass
+        
+        matched = self._find(file_name_lower)
+        if len(self._found) >= self.FIND_CACHE_MAX:
+            self._found.clear()
+        self._found[file_name_lower] = matched
+        return matched
+    
+    def _find(self, file_name_lower: str | bytes) -> Optional[str | bytes]:
+        """Uncached find() on a non-empty index."""
+        if self.is_bytes != isinstance(file_name_lower, bytes):
+            file_name_lower = (
+                os.fsencode(file_name_lower) if self.is_bytes else os.fsdecode(file_name_lower)
+            ).lower()
+        
+        if self.separator in file_name_lower:
+            return None
+        
+        idx = self.lower_haystack.find(file_name_lower)
+        if idx == -1:
+            return None
+        
+        # Lowercasing can change string lengths for some non-ASCII characters,
+        # so recover the entry by counting separators rather than by offset.
+        return self.names[self.lower_haystack.count(self.separator, 0, idx)]
+
+
+@lru_cache(maxsize=32)
+def build_file_index(files: frozenset[str] | frozenset[bytes]) -> FileIndex:
+    """
+    Build a lowercased lookup index for a collection of file names.
+    
+    The index is memoized on the (frozen) set of names, so repeated lookups
+    against the same directory listing only pay the lowercasing cost once.
+    
+    Args:
+        files: Frozen set of file names (str or bytes) to index
+        
+    Returns:
+        FileIndex over the given names
+    """
+    return FileIndex.from_names(files)
+
+
+@lru_cache(maxsize=1)
+def _b64encoder() -> Callable[[bytes], bytes]:
+    """
+    Return the fastest available base64 encoder.
+    
+    pybase64 is an optional dependency with SIMD kernels and the same
+    b64encode() signature and output as the standard library; the stdlib
+    encoder is used when it is not installed. Resolved once so a missing
+    package does not cost a failed import on every call.
+    
+    Returns:
+        A b64encode function
+    """
+    try:
+        from pybase64 import b64encode
+    except ImportError:
+        from base64 import b64encode
+    return b64encode
+
+
+def _open_pdf_reader(file_path: str, file_size: int):
+    """
+    Open a PdfReader, memory-mapping files of at least Config.MMAP_MIN_BYTES.
+    
+    Given a path, pypdf copies the whole file into memory; a read-only
+    mapping lets it seek the page cache instead. The mapping holds its own
+    file descriptor and is released together with the reader.
+    
+    A mapped file must not be truncated in place while a reader is cached,
+    or touching the lost pages raises SIGBUS. The synchronizer replaces
+    storage files by rename for this reason; files written in place by
+    other tools are only safe below Config.MMAP_MIN_BYTES.
+    
+    Args:
+        file_path: Path to the PDF file
+        file_size: Size of the file in bytes
+        
+    Returns:
+        A pypdf PdfReader
+    """
     from pypdf import PdfReader
-except ImportError:
-    PdfReader = None
+    
+    if file_size < Config.MMAP_MIN_BYTES:
+        return PdfReader(file_path)
+    
+    with open(file_path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return PdfReader(mapped)
+
+
+@lru_cache(maxsize=32)
+def _cached_pdf_reader(file_path: str, mtime_ns: int, file_size: int):
+    """
+    Memoized PdfReader for a given file version.
+    
+    Keying on mtime and size means an edited file gets a fresh reader, while
+    repeat reads skip re-parsing the xref table and reuse pypdf's resolved
+    objects. Readers are not thread-safe, so each comes with a lock that
+    callers hold while touching it.
+    
+    Returns:
+        Tuple of (PdfReader, threading.Lock)
+    """
+    return _open_pdf_reader(file_path, file_size), threading.Lock()
+
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Get the shared PDF extraction process pool, creating it on first use.
+    
+    Workers are started through a fork server (spawned where that is not
+    available), never forked from the server itself: its watcher, timer and
+    I/O threads may be holding locks at that moment, such as the
+    _cached_pdf_reader ones, which a forked child would inherit locked.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("forkserver")
+                # By default the fork server imports __main__, i.e. the
+                # whole server; it only needs this module
+                context.set_forkserver_preload([__name__])
+            else:
+                context = multiprocessing.get_context("spawn")
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=Config.PDF_MAX_WORKERS,
+                mp_context=context
+            )
+        return _pdf_pool
+
+
+def _reset_pdf_pool() -> None:
+    """Discard a broken PDF pool so the next extraction starts a fresh one."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+class _PageTimeout(BaseException):
+    """
+    Raised inside pypdf to abandon a page that runs past its deadline.
+    
+    A BaseException, because pypdf extracts form XObjects under an
+    ``except Exception`` that would log and swallow it.
+    """
+
+
+def _extract_page_text(page, page_num: int, timeout: float) -> str:
+    """
+    Extract the text of one PDF page within a time limit.
+    
+    A few pathological pages take minutes to extract. pypdf calls
+    visitor_operand_before for every content stream operator, so checking
+    a deadline there stops a runaway page cooperatively, in any thread or
+    process, without leaving work running in the background.
+    
+    The timeout is best-effort: it is only checked between operators.
+    pypdf decompresses and parses a content stream, and loads its fonts,
+    before the first operator is visited, and that work is not bounded.
+    
+    Args:
+        page: pypdf PageObject to extract
+        page_num: 1-based page number, for the placeholder text
+        timeout: Seconds allowed for the page (0 = no limit)
+        
+    Returns:
+        The page text (empty string for pages without text), or a
+        placeholder if extraction timed out
+    """
+    if not timeout:
+        return page.extract_text() or ""
+    
+    deadline = time.monotonic() + timeout
+    
+    def _check_deadline(*_) -> None:
+        if time.monotonic() > deadline:
+            raise _PageTimeout
+    
+    try:
+        return page.extract_text(visitor_operand_before=_check_deadline) or ""
+    except _PageTimeout:
+        return f"[Page {page_num}: extraction timed out]"
+
+
+def _extract_page_range(file_path: str, start: int, stop: int, timeout: float) -> list[str]:
+    """
+    Extract the text of pages [start, stop) of a PDF.
+    
+    Runs in a PDF pool worker process. Looking the reader up through
+    _cached_pdf_reader lets a worker reuse its parsed PDF across tasks.
+    Workers don't see Config changes made after they started, so the
+    timeout is passed in from the caller's process.
+    
+    Args:
+        file_path: Path to the PDF file
+        start: Index of the first page to extract
+        stop: Index one past the last page to extract
+        timeout: Seconds allowed per page, as for _extract_page_text()
+        
+    Returns:
+        Text of each page in the range (empty string for pages without text)
+    """
+    file_stat = os.stat(file_path)
+    reader, reader_lock = _cached_pdf_reader(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+    with reader_lock:
+        return [
+            _extract_page_text(reader.pages[i], i + 1, timeout) for i in range(start, stop)
+        ]
+
+
+def scandir_names_bytes(directory: str | bytes) -> list[bytes]:
+    """
+    List the names of regular files in a directory as bytes.
+    
+    Scanning with a bytes path makes os.scandir return bytes names directly,
+    skipping the filesystem-encoding decode per entry. The result can be fed
+    to build_file_index() for the bytes lookup fast path.
+    
+    Args:
+        directory: Directory to scan
+        
+    Returns:
+        List of file names as bytes
+    """
+    with os.scandir(os.fsencode(directory)) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
+
 
 class FileReader:
     """
@@ -30,22 +397,25 @@ class FileReader:
         Initialize the FileReader.
         
         Args:
-            file_path: Default path to the file (can be empty)
+            file_path: Default path for read_file() and read_file_lines()
+                       when they are not given one (can be empty); the other
+                       read methods always take their path as an argument
             logger: Logger instance for logging operations
         """
         self.logger = logger
         self.file_path = file_path
     
-    def check_file_exists(self, file_name: str, files: list[str] | set[str]) -> str:
+    def check_file_exists(self, file_name: str | bytes, file_index: FileIndex) -> str | bytes:
         """
-        Check if a file exists in the provided list/set of files.
+        Check if a file exists in the provided file index.
         
         Performs a case-insensitive partial match, which is useful when
         upload portals add tokens to filenames.
         
         Args:
-            file_name: The name of the file to search for (can be partial)
-            files: List or set of file names to search through
+            file_name: The name of the file to search for (can be partial);
+                       bytes are matched with the ASCII-only bytes.lower()
+            file_index: Precomputed index from build_file_index()
             
         Returns:
             The matched filename from the files list
@@ -53,147 +423,191 @@ class FileReader:
         Raises:
             CustomFileNotFoundError: If no matching file is found
         """
+        # Most callers pass the full name, so try exact matches first
+        if file_name in file_index.name_set:
+            self.logger.debug("File '%s' matched exactly", file_name)
+            return file_name
+        
         # Convert to lowercase for case-insensitive matching
         file_name_lower = file_name.lower()
         
-        # Find the first file that contains the search term
-        matched_file = next(
-            (f for f in files if file_name_lower in f.lower()), 
-            None
-        )
+        matched_file = file_index.lower_to_name.get(file_name_lower)
+        if matched_file is None:
+            # Find the first file that contains the search term
+            matched_file = file_index.find(file_name_lower)
         
         if matched_file is None:
-            self.logger.debug(f"File '{file_name}' not found in provided file list")
+            self.logger.debug("File '%s' not found in provided file list", file_name)
             raise CustomFileNotFoundError(
-                file_name=file_name,
+                file_name=os.fsdecode(file_name),
                 searched_paths=["provided file list"]
             )
         
-        self.logger.debug(f"File '{file_name}' matched to '{matched_file}'")
+        self.logger.debug("File '%s' matched to '%s'", file_name, matched_file)
         return matched_file
     
-    def read_file(self, encoding: str = 'utf-8') -> str:
+    def _read(self, file_path: str, encoding: str, reader: Callable[[TextIO], T]) -> T:
         """
-        Read the contents of the file specified in self.file_path.
+        Open a file in text mode and apply a reader to the handle.
+        
+        Shared by read_file and read_file_lines so both map errors the same way.
+        Files of at least Config.MMAP_MIN_BYTES are memory-mapped and decoded
+        straight from the mapping; the reader then gets an in-memory text handle.
         
         Args:
-            encoding: The encoding to use for reading the file (default: utf-8)
+            file_path: Path to the file
+            encoding: The encoding to use for reading the file
+            reader: Callable receiving the open file and returning its contents
             
         Returns:
-            The contents of the file as a string
+            Whatever the reader returns
             
         Raises:
             FileReadError: If the file cannot be read
             ValueError: If file_path is not set
         """
-        if not self.file_path:
+        if not file_path:
             raise ValueError("File path is not set")
         
         try:
-            with open(self.file_path, 'r', encoding=encoding) as file:
-                contents = file.read()
-                self.logger.debug(f"Successfully read file: {self.file_path}")
-                return contents
-        except FileNotFoundError as e:
-            self.logger.error(f"File not found: {self.file_path}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason="File does not exist"
-            ) from e
-        except PermissionError as e:
-            self.logger.error(f"Permission denied: {self.file_path}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason="Permission denied"
-            ) from e
+            with open(file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size >= Config.MMAP_MIN_BYTES:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        contents = str(mapped, encoding)
+                    return reader(io.StringIO(_translate_newlines(contents)))
+                
+                return reader(io.TextIOWrapper(file, encoding=encoding))
         except UnicodeDecodeError as e:
-            self.logger.error(f"Encoding error reading {self.file_path}: {e}")
+            self.logger.error(f"Encoding error reading {file_path}: {e}")
             raise FileReadError(
-                file_name=self.file_path,
+                file_name=file_path,
                 reason=f"Cannot decode file with {encoding} encoding"
             ) from e
+        except OSError as e:
+            reason = _ERRNO_REASONS.get(e.errno, str(e))
+            self.logger.error(f"Error reading {file_path}: {reason}")
+            raise FileReadError(file_name=file_path, reason=reason) from e
         except Exception as e:
-            self.logger.error(f"Unexpected error reading {self.file_path}: {e}")
+            self.logger.error(f"Unexpected error reading {file_path}: {e}")
             raise FileReadError(
-                file_name=self.file_path,
+                file_name=file_path,
                 reason=str(e)
             ) from e
     
-    def read_file_lines(self, encoding: str = 'utf-8') -> list[str]:
+    def read_file(self, encoding: str = 'utf-8', file_path: Optional[str] = None) -> str:
         """
-        Read the contents of the file as a list of lines.
+        Read the contents of a file.
         
         Args:
             encoding: The encoding to use for reading the file (default: utf-8)
+            file_path: Path to the file (default: self.file_path). Passing it
+                       leaves the shared instance untouched, so concurrent
+                       callers need no per-call FileReader.
             
         Returns:
-            List of lines from the file
+            The contents of the file as a string
             
         Raises:
             FileReadError: If the file cannot be read
             ValueError: If file_path is not set
         """
-        if not self.file_path:
-            raise ValueError("File path is not set")
+        file_path = self.file_path if file_path is None else file_path
+        contents = self._read(file_path, encoding, lambda file: file.read())
+        self.logger.debug("Successfully read file: %s", file_path)
+        return contents
+    
+    def read_file_lines(self, encoding: str = 'utf-8', file_path: Optional[str] = None) -> list[str]:
+        """
+        Read the contents of a file as a list of lines.
         
-        try:
-            with open(self.file_path, 'r', encoding=encoding) as file:
-                lines = file.readlines()
-                self.logger.debug(f"Successfully read {len(lines)} lines from: {self.file_path}")
-                return lines
-        except FileNotFoundError as e:
-            self.logger.error(f"File not found: {self.file_path}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason="File does not exist"
-            ) from e
-        except PermissionError as e:
-            self.logger.error(f"Permission denied: {self.file_path}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason="Permission denied"
-            ) from e
-        except UnicodeDecodeError as e:
-            self.logger.error(f"Encoding error reading {self.file_path}: {e}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason=f"Cannot decode file with {encoding} encoding"
-            ) from e
-        except Exception as e:
-            self.logger.error(f"Unexpected error reading {self.file_path}: {e}")
-            raise FileReadError(
-                file_name=self.file_path,
-                reason=str(e)
-            ) from e
+        Args:
+            encoding: The encoding to use for reading the file (default: utf-8)
+            file_path: Path to the file (default: self.file_path)
+            
+        Returns:
+            List of lines from the file
+            
+        Raises:
+            FileReadError: If the file cannot be read
+            ValueError: If file_path is not set
+        """
+        file_path = self.file_path if file_path is None else file_path
+        lines = self._read(file_path, encoding, lambda file: file.readlines())
+        self.logger.debug("Successfully read %d lines from: %s", len(lines), file_path)
+        return lines
 
-    def read_pdf_file(self, file_path: str) -> str:
+    def iter_pdf_text(self, file_path: str) -> Iterator[str]:
         """
-        Read and extract text from a PDF file.
+        Extract text from a PDF file one page at a time.
+        
+        Yielding per-page strings lets callers stream large documents
+        without holding the whole decoded text in memory. PDFs with at least
+        Config.PDF_PARALLEL_MIN_PAGES pages that split into two or more
+        blocks are extracted on a process pool; pages are still yielded in
+        order.
         
         Args:
             file_path: Path to the PDF file
             
-        Returns:
-            Extracted text from the PDF
+        Yields:
+            Extracted text of each page (empty string for pages without text)
             
         Raises:
             FileReadError: If PDF cannot be read or text cannot be extracted
         """
         try:        
-            reader = PdfReader(file_path)
-            text = ""
+            file_stat = os.stat(file_path)
+            reader, reader_lock = _cached_pdf_reader(
+                file_path, file_stat.st_mtime_ns, file_stat.st_size
+            )
+            with reader_lock:
+                page_count = len(reader.pages)
+            timeout = Config.PDF_PAGE_TIMEOUT
             
-            for page_num, page in enumerate(reader.pages, 1):
-                page_text = page.extract_text() or ""
-                text += page_text
-                self.logger.debug(f"Extracted text from page {page_num}")
+            # pypdf extraction is CPU-bound pure Python, so fan page ranges
+            # out to worker processes; each opens the PDF by path itself.
+            # One contiguous block per worker means every worker parses the
+            # document once, with a floor so small PDFs are not over-split.
+            ranges = []
+            if (
+                page_count >= Config.PDF_PARALLEL_MIN_PAGES
+                and Config.PDF_MAX_WORKERS >= 2
+            ):
+                block_size = max(
+                    Config.PDF_MIN_PAGES_PER_TASK,
+                    math.ceil(page_count / Config.PDF_MAX_WORKERS)
+                )
+                ranges = [
+                    (start, min(start + block_size, page_count))
+                    for start in range(0, page_count, block_size)
+                ]
             
-            if not text.strip():
-                self.logger.warning(f"No text extracted from PDF: {file_path}")
-                return "Warning: PDF file appears to be empty or contains only images."
+            # A single block would only add a worker's reparse and the IPC
+            # round trip, so extract it here with the already-parsed reader
+            if len(ranges) < 2:
+                for page_num, page in enumerate(reader.pages, 1):
+                    with reader_lock:
+                        page_text = _extract_page_text(page, page_num, timeout)
+                    yield page_text
+                    self.logger.debug("Extracted text from page %d", page_num)
+                return
             
-            self.logger.info(f"Successfully extracted text from PDF: {file_path}")
-            return text
+            pool = _get_pdf_pool()
+            futures = [
+                pool.submit(_extract_page_range, file_path, start, stop, timeout)
+                for start, stop in ranges
+            ]
+            try:
+                page_texts = (text for future in futures for text in future.result())
+                for page_num, page_text in enumerate(page_texts, 1):
+                    yield page_text
+                    self.logger.debug("Extracted text from page %d", page_num)
+            except BrokenProcessPool:
+                _reset_pdf_pool()
+                raise
+            finally:
+                for future in futures:
+                    future.cancel()
             
         except ImportError as e:
             self.logger.error("pypdf library not available")
@@ -208,6 +622,28 @@ class FileReader:
                 reason=f"PDF extraction failed: {str(e)}"
             ) from e
 
+    def read_pdf_file(self, file_path: str) -> str:
+        """
+        Read and extract text from a PDF file.
+        
+        Args:
+            file_path: Path to the PDF file
+            
+        Returns:
+            Extracted text from the PDF
+            
+        Raises:
+            FileReadError: If PDF cannot be read or text cannot be extracted
+        """
+        text = "".join(self.iter_pdf_text(file_path))
+        
+        if not text.strip():
+            self.logger.warning(f"No text extracted from PDF: {file_path}")
+            return "Warning: PDF file appears to be empty or contains only images."
+        
+        self.logger.info(f"Successfully extracted text from PDF: {file_path}")
+        return text
+
     def read_image_file(self, file_path: str) -> str:
         """
         Read an image file and return base64-encoded content.
@@ -222,14 +658,34 @@ class FileReader:
             FileReadError: If image cannot be read
         """
         try:        
-            with open(file_path, 'rb') as f:
-                binary_content = f.read()
-                encoded_content = base64.b64encode(binary_content).decode('utf-8')
-                
+            b64encode = _b64encoder()
             file_extension = Path(file_path).suffix
+            
+            # The header goes into the same buffer so the result is decoded
+            # once, instead of copying the encoded data again to prepend it
+            encoded = bytearray(
+                f"Image file ({file_extension}) - Base64 encoded:\n".encode('utf-8')
+            )
+            
+            # Encode in chunks whose size is a multiple of 3 so no padding is
+            # emitted mid-stream and the output matches a one-shot encode
+            chunk_size = Config.IMAGE_ENCODE_CHUNK_BYTES
+            with open(file_path, 'rb') as f:
+                file_size = os.fstat(f.fileno()).st_size
+                if file_size >= Config.MMAP_MIN_BYTES:
+                    # Encode slices of the mapping without reading them into
+                    # intermediate bytes objects
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        with memoryview(mapped) as view:
+                            for offset in range(0, file_size, chunk_size):
+                                encoded += b64encode(view[offset:offset + chunk_size])
+                else:
+                    for chunk in iter(lambda: f.read(chunk_size), b''):
+                        encoded += b64encode(chunk)
+            
             self.logger.info(f"Successfully encoded image file: {file_path}")
             
-            return f"Image file ({file_extension}) - Base64 encoded:\n{encoded_content}"
+            return encoded.decode('utf-8')
             
         except Exception as e:
             self.logger.error(f"Error reading image file '{file_path}': {e}")
@@ -239,6 +695,37 @@ class FileReader:
             ) from e
 
 
+    def _check_text_sample(self, file_path: str, sample: bytes) -> None:
+        """
+        Reject files whose leading bytes do not look like text.
+        
+        Args:
+            file_path: Path to the file, for error messages
+            sample: The first Config.BINARY_CHECK_BYTES of the file
+            
+        Raises:
+            InvalidFileTypeError: If the sample looks binary
+        """
+        # Empty files are trivially text
+        if not sample:
+            return
+        
+        if sample.find(b'\x00') != -1:
+            raise InvalidFileTypeError(
+                file_name=file_path,
+                file_type="binary",
+                reason="File contains null bytes and cannot be read as text"
+            )
+        
+        # One C-level pass over the sample strips every text byte
+        nontext = sample.translate(None, _TEXT_BYTES)
+        if len(nontext) > len(sample) * Config.BINARY_NONTEXT_RATIO:
+            raise InvalidFileTypeError(
+                file_name=file_path,
+                file_type="binary",
+                reason="File consists mostly of control bytes and cannot be read as text"
+            )
+
     def read_text_file(self, file_path: str) -> str:
         """
         Read a text file with encoding fallback.
@@ -253,40 +740,47 @@ class FileReader:
             FileReadError: If file cannot be read
             InvalidFileTypeError: If file is binary
         """
-        # Check if file is binary
+        # Read the file once; the same buffer serves the binary check and
+        # decoding. Large files are mapped rather than copied onto the heap.
         try:
             with open(file_path, 'rb') as f:
-                sample = f.read(Config.BINARY_CHECK_BYTES)
-                if b'\x00' in sample:
-                    raise InvalidFileTypeError(
-                        file_name=file_path,
-                        file_type="binary",
-                        reason="File contains null bytes and cannot be read as text"
-                    )
+                if os.fstat(f.fileno()).st_size >= Config.MMAP_MIN_BYTES:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = f.read()
         except Exception as e:
-            if isinstance(e, InvalidFileTypeError):
-                raise
-            self.logger.error(f"Error checking file type: {e}")
+            self.logger.error(f"Error reading file: {e}")
             raise FileReadError(file_name=file_path, reason=str(e)) from e
         
-        # Try reading as text with encoding fallback
-        for encoding in [Config.ENCODING_PRIMARY, Config.ENCODING_FALLBACK]:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    contents = f.read()
-                    self.logger.info(f"Successfully read text file with {encoding} encoding")
-                    return contents
-            except UnicodeDecodeError:
-                if encoding == Config.ENCODING_FALLBACK:
-                    raise FileReadError(
-                        file_name=file_path,
-                        reason=f"Cannot decode file with {encoding} encoding"
-                    )
-                self.logger.debug(f"Failed to read with {encoding}, trying fallback")
-                continue
-            except Exception as e:
-                self.logger.error(f"Error reading file: {e}")
-                raise FileReadError(file_name=file_path, reason=str(e)) from e
-        
-        # This should never be reached but included for safety
-        raise FileReadError(file_name=file_path, reason="All encoding attempts failed")
+        try:
+            # A byte order mark names the encoding outright, so the right codec
+            # is tried first. UTF-16/32 text is full of null bytes and skips
+            # the binary check.
+            bom_encoding = _bom_encoding(data[:4])
+            if bom_encoding in (None, 'utf-8-sig'):
+                self._check_text_sample(file_path, data[:Config.BINARY_CHECK_BYTES])
+                encodings = (bom_encoding or Config.ENCODING_PRIMARY, Config.ENCODING_FALLBACK)
+            else:
+                encodings = (bom_encoding,)
+            
+            # Decode the same buffer with each candidate encoding in turn
+            for encoding in encodings:
+                try:
+                    contents = str(data, encoding)
+                    break
+                except UnicodeDecodeError as e:
+                    decode_error = e
+                    self.logger.debug("Failed to read with %s, trying fallback", encoding)
+            else:
+                raise FileReadError(
+                    file_name=file_path,
+                    reason=f"Cannot decode file with {encoding} encoding"
+                ) from decode_error
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+        
+        contents = _translate_newlines(contents)
+        
+        self.logger.info(f"Successfully read text file with {encoding} encoding")
+        return contents
@@ -7,17 +7,30 @@ and cloning GitHub repositories with comprehensive error handling.
 
 from mcp.server.fastmcp import FastMCP
 import os
+import re
+import stat
 import subprocess
 import logging
+import logging.handlers
+import multiprocessing
 import sys
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, Optional
 from pathlib import Path
-import base64
 
-from filereader import FileReader
+try:
+    import pygit2
+except ImportError:
+    # Optional; clone_github_repo falls back to the git command line
+    pygit2 = None
+
+from filereader import FileIndex, FileReader
 from config import Config
 from synchronizer import FileSynchronizer
-from pypdf import PdfReader
 
 from exceptions import (
     FileReadError,
@@ -32,7 +45,12 @@ logging.basicConfig(
     level=getattr(logging, Config.LOG_LEVEL),
     format=Config.LOG_FORMAT,
     handlers=[
-        logging.FileHandler(Config.LOG_FILE),
+        # Rotated so a long-running server cannot fill the disk with its log
+        logging.handlers.RotatingFileHandler(
+            Config.LOG_FILE,
+            maxBytes=Config.LOG_MAX_BYTES,
+            backupCount=Config.LOG_BACKUP_COUNT
+        ),
         logging.StreamHandler(sys.stderr)
     ]
 )
@@ -43,26 +61,521 @@ file_reader = FileReader("", logger)
 synchronizer = FileSynchronizer()
 mcp = FastMCP(Config.SERVER_NAME)
 
+# Reader for each Config.classify_file() kind; anything else is read as text
+_FILE_READERS = {
+    Config.FILE_KIND_PDF: file_reader.read_pdf_file,
+    Config.FILE_KIND_IMAGE: file_reader.read_image_file,
+}
+
 # Ensure required directories exist
 Config.ensure_directories_exist()
 
-# Perform initial synchronization and start background monitoring
-logger.info("Starting background file synchronizer...")
-synchronizer.start_watching()
+# Perform initial synchronization and start background monitoring; PDF
+# extraction workers re-import this module, and must not start their own
+# (parent_process() is not set yet while they do, but their name is)
+if multiprocessing.current_process().name == "MainProcess":
+    logger.info("Starting background file synchronizer...")
+    synchronizer.start_watching()
+
+# Track files found during directory listing (name -> full path, or None once
+# the name has been listed at more than one path), plus a lowercased lookup
+# index over the names that is rebuilt whenever the set of names changes. Entries are kept in
+# listing order and the least recently listed are dropped past
+# Config.FILE_CACHE_MAX_FILES. Listings may run on several threads, so updates
+# go through _file_cache_lock.
+list_of_files: dict[str, Optional[str]] = {}
+_file_cache_lock = threading.Lock()
+file_index: FileIndex = FileIndex.from_names(())
+
+
+# Per-directory listing cache: path -> (st_mtime_ns, DirectoryListing).
+# A directory's mtime changes whenever an entry is added, removed or renamed,
+# so an unchanged mtime means the cached names are still current.
+_listing_cache: dict[str, tuple[int, "DirectoryListing"]] = {}
+_listing_cache_lock = threading.Lock()
+
+# Formatted build_files output: (directory, max_depth, max_entries) ->
+# (most recent directory, scan_tree listings, output, files seen), reused
+# while scan_tree returns the identical listings
+_tree_output_cache: dict[
+    tuple[str, int, Optional[int]],
+    tuple[Optional[str], tuple["DirectoryListing", ...], str, dict[str, Optional[str]]]
+] = {}
+_tree_output_cache_lock = threading.Lock()
+
+# Threads shared by build_files (listing wide tree levels) and
+# read_latest_content (reading a repository's files)
+_io_pool: Optional[ThreadPoolExecutor] = None
+_io_pool_lock = threading.Lock()
+
+# Name search index: (search root, directory) -> (DirectoryListing the indexes
+# were built from, index over its files, index over its subdirectories). Each
+# FileIndex maps full paths to normalized paths relative to the search root.
+# Search roots may be walked on several threads, so updates go through
+# _name_index_lock.
+_name_index: dict[tuple[str, str], tuple["DirectoryListing", FileIndex, FileIndex]] = {}
+_name_index_lock = threading.Lock()
+
+# Search results: (name, search paths, directories?) -> (matched path,
+# time.monotonic() of the search). Hits are reused for up to
+# Config.SEARCH_CACHE_TTL seconds while the path still exists, and the whole
+# cache is dropped whenever the synchronizer or a clone changes storage.
+_search_cache: dict[tuple[str, tuple[str, ...], bool], tuple[str, float]] = {}
+_search_cache_lock = threading.Lock()
 
-# Track all files found during directory listing
-list_of_files: set[str] = set()
+
+def refresh_file_index() -> None:
+    """
+    Rebuild the lookup index over list_of_files.
+    
+    The name set changes with nearly every listing, so the index is built
+    directly rather than through the memoized build_file_index(), which would
+    keep up to 32 superseded indexes alive.
+    """
+    global file_index
+    with _file_cache_lock:
+        names = tuple(list_of_files)
+    file_index = FileIndex.from_names(names)
+    logger.debug("File index rebuilt with %d files", len(file_index.names))
+
+
+def cached_file_path(file_name: str, search_paths: tuple[str, ...]) -> Optional[str]:
+    """
+    Look up an exact file name in list_of_files.
+    
+    Only names listed at a single path are answered, and only while that
+    path is inside one of the search paths and still exists. Ambiguous,
+    stale or out-of-tree names fall through to a directory search, so the
+    result doesn't depend on which directory was listed last.
+    
+    Args:
+        file_name: Exact file name to look up
+        search_paths: Directory paths the file must be inside
+        
+    Returns:
+        Full path of the listed file, or None
+    """
+    file_path = list_of_files.get(file_name)
+    if file_path is None:
+        return None
+    if not file_path.startswith(tuple(os.path.join(p, '') for p in search_paths)):
+        return None
+    return file_path if os.path.isfile(file_path) else None
 
 
 def update_list_of_files(file_path: str):
     logger.info(f"Updating list of files with: {file_path}")
-    list_files(file_path)    
+    # Fully, so every file of e.g. a fresh clone lands in list_of_files
+    list_files(file_path, depth=Config.DEFAULT_MAX_DEPTH)    
 
 def normalize_name(name: str) -> str:
     """Normalize a name for fuzzy matching by lowercasing and replacing underscores with hyphens."""
+    # Two specialized C passes; a single str.translate() table (or a bytes
+    # translate round trip) measures slower and would drop Unicode lowering
     return name.lower().replace('_', '-')
 
-def find_file_in_paths(file_name: str, search_paths: list[str]) -> Optional[str]:
+@dataclass(frozen=True)
+class DirectoryListing:
+    """Sorted names found in one directory by scan_directory()."""
+    dirs: list[str]
+    files: list[str]
+    symlinked_dirs: frozenset[str]
+
+
+def scan_directory(path: str) -> DirectoryListing:
+    """
+    Return the sorted subdirectory and file names of a directory.
+    
+    Results are cached on the directory's st_mtime_ns, so relisting an
+    unchanged directory costs one stat instead of a readdir plus symlink
+    resolution. An unchanged directory returns the same DirectoryListing
+    object. .git directories are left out.
+    
+    Args:
+        path: Directory to list
+        
+    Returns:
+        DirectoryListing for the directory
+        
+    Raises:
+        OSError: If the directory cannot be stat'ed or read
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _listing_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    # scandir entries carry the file type from readdir, so classifying
+    # them needs no extra stat (except to resolve symlinks)
+    with os.scandir(path) as it:
+        entries = list(it)
+    
+    dirs = []
+    symlinked_dirs = []
+    for entry in entries:
+        if entry.is_dir() and entry.name != '.git':
+            dirs.append(entry.name)
+            if entry.is_symlink():
+                symlinked_dirs.append(entry.name)
+    dirs.sort()
+    files = sorted(entry.name for entry in entries if entry.is_file())
+    listing = DirectoryListing(dirs, files, frozenset(symlinked_dirs))
+    
+    with _listing_cache_lock:
+        if path not in _listing_cache and len(_listing_cache) >= Config.LISTING_CACHE_MAX_DIRS:
+            # Evict the oldest listing
+            del _listing_cache[next(iter(_listing_cache))]
+        _listing_cache[path] = (mtime, listing)
+    return listing
+
+
+def _get_io_pool() -> ThreadPoolExecutor:
+    """Get the shared I/O thread pool, creating it on first use."""
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(
+                max_workers=Config.IO_MAX_WORKERS,
+                thread_name_prefix="io"
+            )
+        return _io_pool
+
+
+def _scan_or_error(path: str) -> DirectoryListing | Exception:
+    """Return scan_directory(path), or the exception it raised."""
+    try:
+        return scan_directory(path)
+    except Exception as e:
+        return e
+
+
+def scan_tree(
+    directory: str,
+    max_depth: int,
+    max_entries: Optional[int] = None
+) -> dict[str, DirectoryListing | Exception]:
+    """
+    List a directory tree level by level.
+    
+    Reading directories is I/O bound and releases the GIL, so levels with
+    at least Config.LISTING_PARALLEL_MIN_DIRS directories are listed on a
+    thread pool; narrower levels are listed inline so small trees never
+    wait on the pool. Config.SKIP_DIRS are not descended into.
+    
+    Args:
+        directory: Root directory to list
+        max_depth: Maximum depth to descend (0 = root only)
+        max_entries: Stop before listing the next level once this many
+                     entries have been seen (None = no limit)
+        
+    Returns:
+        Mapping of each visited directory path to its DirectoryListing, or
+        to the exception raised while listing it
+    """
+    listings: dict[str, DirectoryListing | Exception] = {}
+    level = [directory]
+    depth = 0
+    entry_count = 0
+    while level:
+        if len(level) >= Config.LISTING_PARALLEL_MIN_DIRS:
+            results = list(_get_io_pool().map(_scan_or_error, level))
+        else:
+            results = [_scan_or_error(path) for path in level]
+        
+        next_level = []
+        for path, listing in zip(level, results):
+            listings[path] = listing
+            if isinstance(listing, DirectoryListing):
+                entry_count += len(listing.dirs) + len(listing.files)
+                if depth < max_depth:
+                    prefix = os.path.join(path, '')
+                    next_level.extend(
+                        prefix + d for d in listing.dirs if d not in Config.SKIP_DIRS
+                    )
+        if max_entries is not None and entry_count >= max_entries:
+            break
+        level = next_level
+        depth += 1
+    return listings
+
+
+def _indexed_directories(search_path: str) -> Iterator[tuple[str, FileIndex, FileIndex]]:
+    """
+    Yield search indexes for each directory below search_path.
+    
+    Each directory's files and subdirectories are indexed as FileIndex
+    objects over their full paths, keyed by normalized relative path. A
+    relative path ends with the entry's name, so matching it covers
+    matching the name too, and a partial match becomes one C-level find
+    per directory. Indexes are kept in _name_index until
+    scan_directory() reports a new listing for the directory, so repeated
+    searches only restat directories.
+    
+    Directories are visited depth-first in sorted order; symlinked
+    directories and Config.SKIP_DIRS are not descended into, and
+    unreadable directories are skipped.
+    
+    Args:
+        search_path: Root directory of the search
+        
+    Yields:
+        Tuples of (normalized relative path of the directory followed by a
+        separator, or '' for the root; file index; subdirectory index) per
+        directory
+    """
+    def _index(path: str, names: list[str], rel_prefix: str) -> FileIndex:
+        # normalize_name works per character and leaves separators alone, so
+        # a relative path normalizes to its parent's normalized path plus the
+        # normalized name; each name is normalized exactly once. Entry names
+        # never contain a separator, so full paths are plain concatenations
+        # onto the directory prefix instead of an os.path.join per name
+        prefix = os.path.join(path, '')
+        return FileIndex(
+            tuple(prefix + name for name in names),
+            tuple(rel_prefix + normalize_name(name) for name in names)
+        )
+    
+    # (directory, its normalized relative path followed by a separator)
+    stack = [(search_path, '')]
+    while stack:
+        path, rel_prefix = stack.pop()
+        try:
+            listing = scan_directory(path)
+        except OSError as e:
+            logger.debug("Skipping unreadable directory: %s", e)
+            continue
+        
+        key = (search_path, path)
+        cached = _name_index.get(key)
+        if cached is None or cached[0] is not listing:
+            cached = (
+                listing,
+                _index(path, listing.files, rel_prefix),
+                _index(path, listing.dirs, rel_prefix)
+            )
+            with _name_index_lock:
+                if key not in _name_index and len(_name_index) >= Config.LISTING_CACHE_MAX_DIRS:
+                    del _name_index[next(iter(_name_index))]
+                _name_index[key] = cached
+        
+        _, files_index, dirs_index = cached
+        yield rel_prefix, files_index, dirs_index
+        
+        # Push in reverse so subdirectories are popped in sorted order
+        stack.extend(
+            (full_path, norm_rel + os.sep)
+            for d, full_path, norm_rel in zip(
+                reversed(listing.dirs),
+                reversed(dirs_index.names),
+                reversed(dirs_index.names_lower)
+            )
+            if d not in Config.SKIP_DIRS and d not in listing.symlinked_dirs
+        )
+
+
+def _exact_path(search_path: str, name: str, is_dir: bool) -> Optional[str]:
+    """
+    Return search_path/name if it names an existing file or directory.
+    
+    Lets an exact relative path skip the search walk. Absolute names, names
+    with '..' components, and names that pass through one of the
+    Config.SKIP_DIRS directories the walk never enters are not accepted; nor
+    is a match that a symlink resolves to outside search_path.
+    
+    Args:
+        search_path: Root directory of the search
+        name: Relative path as given by the caller
+        is_dir: Whether to look for a directory instead of a file
+        
+    Returns:
+        The full path, or None if there is no such entry
+    """
+    if os.path.isabs(name):
+        return None
+    parts = name.split(os.sep)
+    if os.pardir in parts or any(part in Config.SKIP_DIRS for part in parts[:-1]):
+        return None
+    candidate = os.path.normpath(os.path.join(search_path, name))
+    found = os.path.isdir(candidate) if is_dir else os.path.isfile(candidate)
+    if not found:
+        return None
+    # isfile/isdir follow symlinks, which the walk does not descend into
+    real_root = os.path.join(os.path.realpath(search_path), '')
+    if not os.path.realpath(candidate).startswith(real_root):
+        return None
+    return candidate
+
+
+def _search_tree(
+    search_path: str,
+    normalized_search: str,
+    dirs: bool,
+    stop: Optional[threading.Event] = None
+) -> Optional[str]:
+    """
+    Find the best match for a normalized name below search_path.
+    
+    An exact match, where the search term equals the entry's name or a
+    trailing run of whole components of its relative path, is preferred
+    over a partial one: the first exact match is returned as soon as it is
+    seen, and otherwise the first partial match in walk order.
+    
+    Args:
+        search_path: Root directory of the search
+        normalized_search: Search term, already passed through normalize_name()
+        dirs: Whether to match directories instead of files
+        stop: Event that abandons the walk (returning None) once set
+        
+    Returns:
+        Full path of the match, or None
+    """
+    # An exact match's name is the term's last component, and the
+    # directory holding it ends with the term's leading components
+    split = normalized_search.rfind(os.sep) + 1
+    head, tail = normalized_search[:split], normalized_search[split:]
+    head_suffix = os.sep + head
+    
+    partial = None
+    for rel_prefix, files_index, dirs_index in _indexed_directories(search_path):
+        if stop is not None and stop.is_set():
+            return None
+        index = dirs_index if dirs else files_index
+        if (os.sep + rel_prefix).endswith(head_suffix):
+            exact = index.lower_to_name.get(rel_prefix + tail)
+            if exact is not None:
+                return exact
+        if partial is None:
+            # Match against the relative path, which ends with the name
+            partial = index.find(normalized_search)
+    return partial
+
+
+def _search_root(
+    search_path: str,
+    name: str,
+    normalized_search: str,
+    dirs: bool,
+    stop: Optional[threading.Event] = None
+) -> Optional[str]:
+    """
+    Search one root for a file or directory, logging rather than raising errors.
+    
+    Args:
+        search_path: Root directory of the search
+        name: Name or path as given by the caller
+        normalized_search: name passed through normalize_name()
+        dirs: Whether to match directories instead of files
+        stop: Event that abandons the search once set
+        
+    Returns:
+        Full path of the match, or None
+    """
+    if not os.path.exists(search_path):
+        logger.warning(f"Search path does not exist: {search_path}")
+        return None
+    
+    # An exact relative path needs no walk
+    full_path = _exact_path(search_path, name, is_dir=dirs)
+    if full_path is not None:
+        return full_path
+    
+    try:
+        return _search_tree(search_path, normalized_search, dirs, stop)
+    except PermissionError as e:
+        logger.warning(f"Permission denied accessing {search_path}: {e}")
+    except Exception as e:
+        logger.error(f"Error searching in {search_path}: {e}")
+    return None
+
+
+def _search_paths(name: str, search_paths: tuple[str, ...], dirs: bool) -> Optional[str]:
+    """
+    Search several roots in order and return the first root's match.
+    
+    With more than one root, the roots are searched concurrently on the
+    shared I/O pool, since each walk mostly waits on stat and readdir.
+    Results are still taken in search path order, and once one root
+    matches, the walks of the later roots are stopped.
+    
+    Args:
+        name: Name or path to search for
+        search_paths: Directory paths to search, in priority order
+        dirs: Whether to match directories instead of files
+        
+    Returns:
+        Full path of the match, or None
+    """
+    normalized_search = normalize_name(name)
+    
+    if len(search_paths) < 2:
+        matches = (
+            _search_root(search_path, name, normalized_search, dirs)
+            for search_path in search_paths
+        )
+        return next((m for m in matches if m is not None), None)
+    
+    stop = threading.Event()
+    futures = [
+        _get_io_pool().submit(_search_root, search_path, name, normalized_search, dirs, stop)
+        for search_path in search_paths
+    ]
+    try:
+        for future in futures:
+            full_path = future.result()
+            if full_path is not None:
+                return full_path
+        return None
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+
+
+def invalidate_search_cache() -> None:
+    """Forget all memoized find_file_in_paths/find_directory_in_paths results."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+
+synchronizer.on_change = invalidate_search_cache
+
+
+def _cached_search(name: str, search_paths: tuple[str, ...], dirs: bool) -> Optional[str]:
+    """
+    _search_paths() memoized through _search_cache.
+    
+    Only hits are cached, and a hit whose path has since disappeared is
+    searched again, so a cached answer is never a missing file. Changes
+    made behind the server's back (not by the synchronizer or a clone) can
+    only make a hit outrank a newer, better match until it expires.
+    
+    Args:
+        name: Name or path to search for
+        search_paths: Directory paths to search, in priority order
+        dirs: Whether to match directories instead of files
+        
+    Returns:
+        Full path of the match, or None
+    """
+    key = (name, search_paths, dirs)
+    cached = _search_cache.get(key)
+    if cached is not None:
+        full_path, searched_at = cached
+        if time.monotonic() - searched_at < Config.SEARCH_CACHE_TTL and (
+            os.path.isdir(full_path) if dirs else os.path.isfile(full_path)
+        ):
+            return full_path
+    
+    full_path = _search_paths(name, search_paths, dirs)
+    if full_path is not None:
+        with _search_cache_lock:
+            if key not in _search_cache and len(_search_cache) >= Config.SEARCH_CACHE_MAX_ENTRIES:
+                del _search_cache[next(iter(_search_cache))]
+            _search_cache[key] = (full_path, time.monotonic())
+    return full_path
+
+
+def find_file_in_paths(file_name: str, search_paths: tuple[str, ...]) -> Optional[str]:
     """
     Search for a file across multiple directory paths.
     
@@ -72,50 +585,18 @@ def find_file_in_paths(file_name: str, search_paths: list[str]) -> Optional[str]
     
     Args:
         file_name: Name or path of the file to search for (can be partial)
-        search_paths: List of directory paths to search
+        search_paths: Directory paths to search
         
     Returns:
         Full path to the matched file, or None if not found
     """
-    normalized_search = normalize_name(file_name)
-    
-    for search_path in search_paths:
-        if not os.path.exists(search_path):
-            logger.warning(f"Search path does not exist: {search_path}")
-            continue
-            
-        try:
-            for root, dirs, files in os.walk(search_path):
-                # Skip .git directories
-                dirs[:] = [d for d in dirs if d != '.git']
-                
-                # Check for partial match against both filename and relative path
-                for f in files:
-                    full_path = os.path.join(root, f)
-                    # Get the relative path from the search_path root
-                    relative_path = os.path.relpath(full_path, search_path)
-                    
-                    # Normalize for comparison
-                    norm_f = normalize_name(f)
-                    norm_rel = normalize_name(relative_path)
-                    
-                    # Match against either the filename or the relative path
-                    if (normalized_search in norm_f or 
-                        normalized_search in norm_rel):
-                        logger.info(f"File '{file_name}' matched to: {full_path} (relative: {relative_path})")
-                        return full_path
-                    
-        except PermissionError as e:
-            logger.warning(f"Permission denied accessing {search_path}: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Error searching in {search_path}: {e}")
-            continue
-    
-    return None
+    full_path = _cached_search(file_name, search_paths, dirs=False)
+    if full_path is not None:
+        logger.info(f"File '{file_name}' matched to: {full_path}")
+    return full_path
 
 
-def find_directory_in_paths(directory_name: str, search_paths: list[str]) -> Optional[str]:
+def find_directory_in_paths(directory_name: str, search_paths: tuple[str, ...]) -> Optional[str]:
     """
     Search for a directory across multiple directory paths.
     
@@ -123,48 +604,15 @@ def find_directory_in_paths(directory_name: str, search_paths: list[str]) -> Opt
     
     Args:
         directory_name: Name or path of the directory to search for
-        search_paths: List of directory paths to search within
+        search_paths: Directory paths to search within
         
     Returns:
         Full path to the matched directory, or None if not found
     """
-    normalized_search = normalize_name(directory_name)
-    
-    for search_path in search_paths:
-        if not os.path.exists(search_path):
-            logger.warning(f"Search path does not exist: {search_path}")
-            continue
-            
-        try:
-            for root, dirs, files in os.walk(search_path):
-                # Skip .git directories
-                dirs[:] = [d for d in dirs if d != '.git']
-                
-                # Check for partial match against directory names and relative paths
-                for d in dirs:
-                    full_path = os.path.join(root, d)
-                    # Get the relative path from the search_path root
-                    relative_path = os.path.relpath(full_path, search_path)
-                    
-                    # Normalize for comparison
-                    norm_d = normalize_name(d)
-                    norm_rel = normalize_name(relative_path)
-                    
-                    # Match against either the directory name or the relative path
-                    if (normalized_search in norm_d or 
-                        normalized_search in norm_rel):
-                        logger.info(f"Directory '{directory_name}' matched to: {full_path} (relative: {relative_path})")
-                        return full_path
-                    
-        except PermissionError as e:
-            logger.warning(f"Permission denied accessing {search_path}: {e}")
-            continue
-        except Exception as e:
-            logger.error(f"Error searching in {search_path}: {e}")
-            continue
-    
-    return None
-
+    full_path = _cached_search(directory_name, search_paths, dirs=True)
+    if full_path is not None:
+        logger.info(f"Directory '{directory_name}' matched to: {full_path}")
+    return full_path
 
 
 @mcp.tool()
@@ -195,19 +643,24 @@ def read_file(file_name: str) -> str:
     file_name = file_name.strip()
     
     logger.info(f"Reading file: {file_name}")
-    logger.debug(f"Cached files: {len(list_of_files)} files")
+    logger.debug("Cached files: %d files", len(list_of_files))
     
     try:
-        # First check in cached file list
+        search_paths = Config.get_search_paths()
+        file_path = None
+        
+        # First check in cached file list; an exact name listed under a
+        # search path is used directly if it is still there
         try:
-            matched_file = file_reader.check_file_exists(file_name, list_of_files)
-            logger.debug(f"File found in cache: {matched_file}")
+            matched_file = file_reader.check_file_exists(file_name, file_index)
+            logger.debug("File found in cache: %s", matched_file)
+            file_path = cached_file_path(file_name, search_paths)
         except CustomFileNotFoundError:
-            logger.debug(f"File not in cache, searching directories")
+            logger.debug("File not in cache, searching directories")
         
         # Search in configured paths
-        search_paths = Config.get_search_paths()
-        file_path = find_file_in_paths(file_name, search_paths)
+        if file_path is None:
+            file_path = find_file_in_paths(file_name, search_paths)
         
         if file_path is None:
             searched = ", ".join(search_paths)
@@ -215,12 +668,8 @@ def read_file(file_name: str) -> str:
             return f"Error: File '{file_name}' not found.\nSearched in: {searched}"
         
         # Determine file type and read accordingly
-        if Config.is_pdf_file(file_path):
-            return file_reader.read_pdf_file(file_path)
-        elif Config.is_image_file(file_path):
-            return file_reader.read_image_file(file_path)
-        else:
-            return file_reader.read_text_file(file_path)
+        reader = _FILE_READERS.get(Config.classify_file(file_path), file_reader.read_text_file)
+        return reader(file_path)
             
     except InvalidFileTypeError as e:
         return f"Error: {e.message}\n{e.details}"
@@ -282,14 +731,80 @@ def read_file(file_name: str) -> str:
 #     except Exception as e:
 #         logger.exception(f"Unexpected error reading files within folder '{folder_name}'")
 #         return f"Error: An unexpected error occurred: {str(e)}"
+
+# Supported clone URLs; group 1 is the repository name, i.e. the last path
+# component (or the part after "host:" for scp-style ssh URLs) without .git
+_REPO_URL_RE = re.compile(r'(?:https?://(?:.*/)?|git@(?:.*[:/])?)(.*?)(?:\.git)?')
+
+
+if pygit2 is not None:
+    class _DeadlineCallbacks(pygit2.RemoteCallbacks):
+        """Remote callbacks that abort a pygit2 transfer once a deadline passes."""
+        
+        def __init__(self, deadline: float):
+            super().__init__()
+            self.deadline = deadline
+        
+        def _check(self):
+            # Raised from a callback, pygit2 aborts the clone and re-raises it
+            if time.monotonic() > self.deadline:
+                raise TimeoutError("clone deadline passed")
+        
+        def sideband_progress(self, string):
+            self._check()
+        
+        def transfer_progress(self, stats):
+            self._check()
+
+
+def _pygit2_clone(url: str, destination: str, shallow: bool):
+    """
+    Clone with pygit2 within Config.CLONE_TIMEOUT_SECONDS.
+    
+    The progress callbacks abort a transfer that runs past the deadline.
+    A remote that stalls completely calls no callbacks, so the clone also
+    runs on a daemon thread that is given up on at the deadline; it ends
+    by itself once the connection does.
     
+    Args:
+        url: http(s) repository URL
+        destination: Directory to clone into
+        shallow: Fetch only the latest commit
+        
+    Raises:
+        TimeoutError: If the clone did not finish in time
+        pygit2.GitError: If the clone failed
+    """
+    timeout = Config.CLONE_TIMEOUT_SECONDS
+    callbacks = _DeadlineCallbacks(time.monotonic() + timeout)
+    errors: list[BaseException] = []
+    
+    def clone():
+        try:
+            pygit2.clone_repository(
+                url, destination, depth=1 if shallow else 0, callbacks=callbacks
+            )
+        except BaseException as e:
+            errors.append(e)
+    
+    thread = threading.Thread(target=clone, name="pygit2-clone", daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"clone of {url} still running after {timeout} seconds")
+    if errors:
+        raise errors[0]
+
+
 @mcp.tool()
-def clone_github_repo(url: str) -> str:
+def clone_github_repo(url: str, shallow: bool = True) -> str:
     """
     Clone a GitHub repository.
     
     Args:
         url: The URL of the GitHub repository to clone
+        shallow: Fetch only the latest commit of the default branch. The
+                 files are the same; pass False when the history is needed.
         
     Returns:
         Success message with cloned repository path, or error message
@@ -301,45 +816,60 @@ def clone_github_repo(url: str) -> str:
     logger.info(f"Cloning repository: {url}")
     
     try:
-        # Validate URL format
-        if not url.startswith(('http://', 'https://', 'git@')):
+        # Validate URL format and extract the repository name in one match
+        url_match = _REPO_URL_RE.fullmatch(url.rstrip('/'))
+        if url_match is None:
             return "Error: Invalid repository URL format. Must start with http://, https://, or git@"
         
-        # Extract repository name from URL
-        repo_name = url.rstrip('/').split('/')[-1]
-        if repo_name.endswith('.git'):
-            repo_name = repo_name[:-4]
+        repo_name = url_match.group(1)
         
         if not repo_name:
             return "Error: Could not extract repository name from URL."
         
-        repo_destination = os.path.join(Config.STORAGE_PATH, repo_name)
+        repo_destination = os.path.join(Config.storage_path(), repo_name)
         
         # Check if repository already exists
         if os.path.exists(repo_destination):
             logger.warning(f"Repository already exists at: {repo_destination}")
             return f"Warning: Repository '{repo_name}' already exists at '{repo_destination}'."
         
-        # Construct and execute git clone command
-        command = ["git", "clone", url, repo_destination]
-        
-        logger.debug(f"Executing: {' '.join(command)}")
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
-        )
+        if pygit2 is not None and url.startswith(('http://', 'https://')):
+            # Clone in-process through libgit2 instead of starting git. ssh
+            # URLs keep using the git CLI, which knows the user's ssh setup.
+            logger.debug("Cloning with pygit2: %s", url)
+            try:
+                _pygit2_clone(url, repo_destination, shallow)
+            except pygit2.GitError as e:
+                logger.error(f"Git clone failed: {e}")
+                return f"Error cloning repository: {e}"
+        else:
+            # Construct and execute git clone command
+            command = ["git", "clone"]
+            if shallow:
+                command += ["--depth=1", "--single-branch"]
+            command += [url, repo_destination]
+            
+            logger.debug("Executing: %s", ' '.join(command))
+            # Only stderr is kept, for the error message; stdout is discarded
+            # rather than buffered for the whole clone
+            subprocess.run(
+                command,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=Config.CLONE_TIMEOUT_SECONDS
+            )
         
+        invalidate_search_cache()
         update_list_of_files(repo_destination)
                 
         logger.info(f"Repository cloned successfully to: {repo_destination}")
         return f"Repository '{url}' cloned successfully to '{repo_destination}'."
         
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, TimeoutError):
         logger.error(f"Clone operation timed out for: {url}")
-        return f"Error: Clone operation timed out after 5 minutes."
+        return f"Error: Clone operation timed out after {Config.CLONE_TIMEOUT_SECONDS} seconds."
     except subprocess.CalledProcessError as e:
         logger.error(f"Git clone failed: {e.stderr}")
         error_msg = e.stderr.strip() if e.stderr else "Unknown git error"
@@ -357,31 +887,36 @@ def clone_github_repo(url: str) -> str:
 def get_most_recent_directory(path: str) -> Optional[str]:
     """Find the most recently modified directory in the given path."""
     try:
-        if not os.path.exists(path):
-            return None
-            
-        directories = []
-        for item in os.listdir(path):
-            item_path = os.path.join(path, item)
-            if os.path.isdir(item_path) and item not in ['.git', '.github']:
-                directories.append((item, os.path.getmtime(item_path)))
+        # DirEntry.is_dir() uses the readdir file type, so only directories
+        # cost a stat (for their mtime)
+        with os.scandir(path) as it:
+            directories = [
+                (entry.name, entry.stat().st_mtime) for entry in it
+                if entry.is_dir() and entry.name not in ('.git', '.github')
+            ]
         
         if not directories:
             return None
             
-        # Sort by mtime descending
-        directories.sort(key=lambda x: x[1], reverse=True)
-        return directories[0][0]
+        # Only the newest entry is needed, so take the max instead of sorting
+        return max(directories, key=lambda x: x[1])[0]
     except Exception:
         return None
 
-def build_files(directory: str, max_depth: int = Config.DEFAULT_MAX_DEPTH) -> str:
+def build_files(
+    directory: str,
+    max_depth: int = Config.DEFAULT_MAX_DEPTH,
+    max_entries: Optional[int] = None
+) -> str:
     """
     Build a string representation of files and directories.
     
     Args:
         directory: The root directory to list
         max_depth: Maximum depth to traverse (0 = current dir only, 1 = one level deep, etc.)
+        max_entries: Entry budget; once a tree level brings the total past it,
+                     deeper levels are left out and the listing ends with a
+                     truncation note (None = no limit)
         
     Returns:
         Formatted string listing of directory contents
@@ -389,74 +924,231 @@ def build_files(directory: str, max_depth: int = Config.DEFAULT_MAX_DEPTH) -> st
     Raises:
         DirectoryAccessError: If directory cannot be accessed
     """
-    if not os.path.exists(directory):
+    return "".join(iter_files(directory, max_depth, max_entries))
+
+
+def iter_files(
+    directory: str,
+    max_depth: int = Config.DEFAULT_MAX_DEPTH,
+    max_entries: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Like build_files(), but return the listing as an iterator of chunks.
+    
+    Callers that combine several listings can join all the chunks once
+    instead of joining each listing into its own string first. The
+    directory is checked before this returns, so errors are raised here
+    rather than on first iteration.
+    
+    Args:
+        directory: The root directory to list
+        max_depth: Maximum depth to traverse (0 = current dir only, 1 = one level deep, etc.)
+        max_entries: Entry budget, as for build_files()
+        
+    Returns:
+        Iterator over the pieces of the formatted listing
+        
+    Raises:
+        DirectoryAccessError: If directory cannot be accessed
+    """
+    # A single stat answers both "does it exist" and "is it a directory";
+    # any stat failure (missing, a file in the path, no permission) counts
+    # as missing, as os.path.exists() would
+    try:
+        directory_stat = os.stat(directory)
+    except OSError:
         raise DirectoryAccessError(
             directory=directory,
             reason="Directory does not exist"
         )
     
-    if not os.path.isdir(directory):
+    if not stat.S_ISDIR(directory_stat.st_mode):
         raise DirectoryAccessError(
             directory=directory,
             reason="Path is not a directory"
         )
     
-    output = ""
+    return _format_tree(directory, max_depth, max_entries)
+
+
+def _format_tree(directory: str, max_depth: int, max_entries: Optional[int]) -> Iterator[str]:
+    """
+    Yield the build_files() listing of a directory in chunks.
+    
+    The formatted output is kept in _tree_output_cache. scan_directory()
+    hands back the very same DirectoryListing for a directory whose mtime
+    has not changed, so when every listing (and the most recent directory)
+    is identical to the cached run, the cached text is returned instead of
+    being formatted again; checking costs one stat per directory. Once the
+    listing is exhausted, the files it saw are merged into list_of_files.
+    
+    Args:
+        directory: Existing directory to list
+        max_depth: Maximum depth to traverse
+        max_entries: Entry budget passed to scan_tree()
+        
+    Yields:
+        Consecutive pieces of the formatted listing
+    """
     most_recent_dir = get_most_recent_directory(directory)
     
-    def _list_dir(path: str, current_depth: int = 0) -> None:
-        """Recursive helper to list directory contents."""
-        nonlocal output
+    # List the whole tree up front (in parallel for wide levels), then
+    # format it depth-first in sorted order
+    listings = scan_tree(directory, max_depth, max_entries)
+    
+    key = (directory, max_depth, max_entries)
+    cached = _tree_output_cache.get(key)
+    if (
+        cached is not None
+        and cached[0] == most_recent_dir
+        and len(cached[1]) == len(listings)
+        and all(a is b for a, b in zip(cached[1], listings.values()))
+    ):
+        _, _, output, listed_files = cached
+        yield output
+    else:
+        # Files seen by this listing, merged into list_of_files in one locked update
+        listed_files: dict[str, Optional[str]] = {}
+        chunks = []
+        formatted = _format_listings(
+            directory, max_depth, max_entries, listings, most_recent_dir, listed_files
+        )
+        for chunk in formatted:
+            chunks.append(chunk)
+            yield chunk
+        
+        # Errors are new exception objects on every scan, so a tree with
+        # unreadable directories would never match; don't keep it
+        if not any(isinstance(listing, Exception) for listing in listings.values()):
+            with _tree_output_cache_lock:
+                _tree_output_cache.pop(key, None)
+                if len(_tree_output_cache) >= Config.LISTING_OUTPUT_CACHE_MAX:
+                    del _tree_output_cache[next(iter(_tree_output_cache))]
+                _tree_output_cache[key] = (
+                    most_recent_dir, tuple(listings.values()), "".join(chunks), listed_files
+                )
+    
+    _remember_files(listed_files)
+
+
+def _format_listings(
+    directory: str,
+    max_depth: int,
+    max_entries: Optional[int],
+    listings: dict[str, DirectoryListing | Exception],
+    most_recent_dir: Optional[str],
+    listed_files: dict[str, Optional[str]]
+) -> Iterator[str]:
+    """
+    Format scan_tree() results depth-first for _format_tree().
+    
+    Args:
+        directory: Root of the listing
+        max_depth: Maximum depth to traverse
+        max_entries: Entry budget scan_tree() was given
+        listings: scan_tree() results
+        most_recent_dir: Subdirectory of the root to mark as most recent
+        listed_files: Filled with name -> full path of every listed file,
+                      or None for names seen at more than one path
         
+    Yields:
+        Consecutive pieces of the formatted listing
+    """
+    # Set when scan_tree stopped on the entry budget before reaching a
+    # directory the depth limit would have included
+    truncated = False
+    
+    # Walk with an explicit stack instead of recursing per directory;
+    # children are pushed in reverse so they pop in sorted order and the
+    # output stays depth-first
+    stack = [(directory, 0)]
+    while stack:
+        path, current_depth = stack.pop()
         try:
-            items = os.listdir(path)
+            listing = listings[path]
+            if isinstance(listing, Exception):
+                raise listing
+            dirs, files = listing.dirs, listing.files
             
-            # Separate directories and files
-            dirs = [
-                item for item in items 
-                if os.path.isdir(os.path.join(path, item)) and item != '.git'
-            ]
-            files = [
-                item for item in items 
-                if os.path.isfile(os.path.join(path, item))
-            ]
-            
-            # Update global file cache
-            list_of_files.update(files)
+            # Record files for the global file cache; a name seen twice is
+            # ambiguous and left to the directory search
+            prefix = os.path.join(path, '')
+            for f in files:
+                # Interned so relisting the same tree reuses one string per path
+                file_path = sys.intern(prefix + f)
+                if listed_files.setdefault(f, file_path) is not file_path:
+                    listed_files[f] = None
             
             # Build output
-            output += f"Directory: {path}\n"
+            yield f"Directory: {path}\n"
             if dirs:
                 dir_list = []
-                for d in sorted(dirs):
+                for d in dirs:
                     # Mark the most recent directory if we are in the root storage path
                     if current_depth == 0 and d == most_recent_dir:
                         dir_list.append(f"{d} [MOST RECENT]")
                     else:
                         dir_list.append(d)
-                output += f"  Subdirectories: {', '.join(dir_list)}\n"
+                yield f"  Subdirectories: {', '.join(dir_list)}\n"
             if files:
-                output += f"  Files: {', '.join(sorted(files))}\n"
-            output += "\n"
+                yield f"  Files: {', '.join(files)}\n"
+            yield "\n"
             
-            # Recursively list subdirectories if within depth limit
+            # Queue subdirectories if within depth limit; Config.SKIP_DIRS are
+            # named above but not entered
             if current_depth < max_depth:
-                for d in sorted(dirs):
-                    _list_dir(os.path.join(path, d), current_depth + 1)
+                children = [
+                    prefix + d for d in reversed(dirs) if d not in Config.SKIP_DIRS
+                ]
+                listed_children = [child for child in children if child in listings]
+                truncated = truncated or len(listed_children) != len(children)
+                stack.extend((child, current_depth + 1) for child in listed_children)
                     
         except PermissionError:
-            output += f"Directory: {path}\n  Error: Permission denied\n\n"
+            yield f"Directory: {path}\n  Error: Permission denied\n\n"
             logger.warning(f"Permission denied: {path}")
         except Exception as e:
-            output += f"Directory: {path}\n  Error: {str(e)}\n\n"
+            yield f"Directory: {path}\n  Error: {str(e)}\n\n"
             logger.error(f"Error listing directory {path}: {e}")
     
-    _list_dir(directory)
-    return output
+    if truncated:
+        yield (
+            f"... (truncated after {max_entries} entries; "
+            f"list a subdirectory to see the rest)\n\n"
+        )
+
+
+def _remember_files(listed_files: dict[str, Optional[str]]) -> None:
+    """
+    Merge a listing's files into list_of_files.
+    
+    A name already known at a different path is marked ambiguous (None)
+    rather than overwritten, so lookups don't depend on listing order.
+    
+    Args:
+        listed_files: Name -> full path (None if ambiguous) of each file the
+                      listing saw
+    """
+    with _file_cache_lock:
+        # Move relisted names to the end so eviction drops the stalest first
+        relisted = list_of_files.keys() & listed_files.keys()
+        conflicting = [
+            f for f in relisted if list_of_files.pop(f) != listed_files[f]
+        ]
+        list_of_files.update(listed_files)
+        for f in conflicting:
+            list_of_files[f] = None
+        overflow = len(list_of_files) - Config.FILE_CACHE_MAX_FILES
+        if overflow > 0:
+            for f in list(islice(list_of_files, overflow)):
+                del list_of_files[f]
+        names_changed = len(relisted) != len(listed_files) or overflow > 0
+    if names_changed:
+        refresh_file_index()
 
 
 @mcp.tool()
-def list_files(directory: str = ".") -> str:
+def list_files(directory: str = ".", depth: int = Config.LIST_FILES_DEPTH) -> str:
     """
     List the files and subdirectories in a directory.
     
@@ -465,6 +1157,9 @@ def list_files(directory: str = ".") -> str:
                   - "." or "" (empty): Lists all files in default storage and upload directories
                   - A directory name: "small-test-repo" (searches in storage paths)
                   - An absolute path: "/home/user/folder"
+        depth: How many levels of subdirectories to descend into
+               (0 = only the directory itself). Very large trees are cut
+               off after Config.LISTING_MAX_ENTRIES entries either way.
                   
     Returns:
         Formatted list of files and directories with subdirectories and file counts
@@ -476,24 +1171,30 @@ def list_files(directory: str = ".") -> str:
     try:
         # Default to storage folder when directory is empty or "."
         if directory in (".", ""):
-            output = "=== Storage Folder ===\n"
+            parts = ["=== Storage Folder ===\n"]
             try:
-                output += build_files(Config.STORAGE_PATH, max_depth=Config.DEFAULT_MAX_DEPTH)
+                parts.extend(iter_files(
+                    Config.storage_path(),
+                    max_depth=depth,
+                    max_entries=Config.LISTING_MAX_ENTRIES
+                ))
             except DirectoryAccessError as e:
-                output += f"Error: {e.message}\n"
+                parts.append(f"Error: {e.message}\n")
                 logger.warning(f"Storage directory not accessible: {e.details}")
             
             # Also list uploaded files if path exists
             if os.path.exists(Config.UPLOADED_FILES_PATH):
-                output += "\n=== Uploaded Files ===\n"
+                parts.append("\n=== Uploaded Files ===\n")
                 try:
-                    output += build_files(
+                    parts.extend(iter_files(
                         Config.UPLOADED_FILES_PATH,
-                        max_depth=Config.DEFAULT_MAX_DEPTH
-                    )
+                        max_depth=depth,
+                        max_entries=Config.LISTING_MAX_ENTRIES
+                    ))
                 except DirectoryAccessError as e:
-                    output += f"Error: {e.message}\n"
+                    parts.append(f"Error: {e.message}\n")
                     logger.warning(f"Upload directory not accessible: {e.details}")
+            output = "".join(parts)
         else:
             # List specific directory
             directory = directory.strip()
@@ -514,10 +1215,14 @@ def list_files(directory: str = ".") -> str:
                 if not os.path.isabs(directory):
                     directory = os.path.abspath(directory)
             
-            # For specific directories, we want to see the contents, so use default depth
-            output = build_files(directory, max_depth=Config.DEFAULT_MAX_DEPTH)
+            output = build_files(
+                directory,
+                max_depth=depth,
+                max_entries=Config.LISTING_MAX_ENTRIES
+            )
         
         logger.info("Listed files successfully")
+        logger.debug("Listing length: %d characters", len(output))
         return output
         
     except DirectoryAccessError as e:
@@ -531,6 +1236,34 @@ def list_files(directory: str = ".") -> str:
         return f"Error: An unexpected error occurred: {str(e)}"
 
 
+def read_context_file(file_path: str) -> str:
+    """
+    Read one file for read_latest_content.
+    
+    Images and binary files are summarized by a placeholder, and errors
+    are reported inline so one bad file does not abort the whole read.
+    Safe to call from several threads at once.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The file's content, a placeholder, or an error line
+    """
+    try:
+        file_kind = Config.classify_file(file_path)
+        if file_kind == Config.FILE_KIND_IMAGE:
+            return "[Image File]"
+        if file_kind == Config.FILE_KIND_PDF:
+            return file_reader.read_pdf_file(file_path)
+        try:
+            return file_reader.read_text_file(file_path)
+        except InvalidFileTypeError:
+            return "[Binary File]"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
 @mcp.tool()
 def read_latest_content() -> str:
     """
@@ -546,95 +1279,89 @@ def read_latest_content() -> str:
         The content of the most recent file or all files in the most recent repository.
     """
     try:
-        storage_path = Config.STORAGE_PATH
-        if not os.path.exists(storage_path):
-            return f"Error: Storage directory does not exist: {storage_path}"
-            
-        # Find most recent item (file or dir)
+        storage_path = Config.storage_path()
+        # Find most recent item (file or dir). scandir builds the entry
+        # paths in C and each entry needs just the one stat for its mtime
         items = []
-        for item in os.listdir(storage_path):
-            if item in ['.git', '.github', '.DS_Store']:
-                continue
+        try:
+            storage_entries = os.scandir(storage_path)
+        except FileNotFoundError:
+            return f"Error: Storage directory does not exist: {storage_path}"
+        with storage_entries as it:
+            for entry in it:
+                if entry.name in ('.git', '.github', '.DS_Store'):
+                    continue
                 
-            item_path = os.path.join(storage_path, item)
-            mtime = os.path.getmtime(item_path)
-            is_dir = os.path.isdir(item_path)
-            items.append((item, item_path, mtime, is_dir))
+                try:
+                    item_stat = entry.stat()
+                except OSError:
+                    # A dangling symlink, or removed since it was listed
+                    continue
+                is_dir = stat.S_ISDIR(item_stat.st_mode)
+                items.append((entry.name, entry.path, item_stat.st_mtime, is_dir))
             
         if not items:
             return "No files or repositories found in storage."
             
-        # Sort by modification time (newest first)
-        items.sort(key=lambda x: x[2], reverse=True)
-        name, path, mtime, is_dir = items[0]
+        # Pick the most recently modified item
+        name, path, mtime, is_dir = max(items, key=lambda x: x[2])
         
         from datetime import datetime
         timestamp = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
         current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        output = f"*** CONTEXT UPDATE: LATEST CONTENT DETECTED ***\n"
-        output += f"Time: {current_time}\n"
-        output += f"Latest Item: {name} ({'Directory/Repository' if is_dir else 'File'})\n"
-        output += f"Last Modified: {timestamp}\n"
-        output += f"Location: {path}\n"
-        output += f"NOTE: Focus ONLY on the content below. Ignore previous context.\n\n"
-        output += f"=== START OF CONTENT ===\n\n"
+        parts = [
+            f"*** CONTEXT UPDATE: LATEST CONTENT DETECTED ***\n",
+            f"Time: {current_time}\n",
+            f"Latest Item: {name} ({'Directory/Repository' if is_dir else 'File'})\n",
+            f"Last Modified: {timestamp}\n",
+            f"Location: {path}\n",
+            f"NOTE: Focus ONLY on the content below. Ignore previous context.\n\n",
+            f"=== START OF CONTENT ===\n\n",
+        ]
         
-        files_content = []
+        # (label, content) per file; the texts are only copied by the final join
+        files_content: list[tuple[str, str]] = []
         
         if is_dir:
             # It's a repository/directory - read all files inside
+            relative_paths = []
+            full_paths = []
+            # os.walk joins every path onto `path`, so stripping that prefix
+            # gives the relative path without relpath's normalization
+            prefix_len = len(os.path.join(path, ''))
             for root, dirs, files in os.walk(path):
-                dirs[:] = [d for d in dirs if d != '.git']
+                dirs[:] = [d for d in dirs if d not in Config.SKIP_DIRS]
                 
+                root_prefix = os.path.join(root, '')
                 for file_name in files:
-                    full_path = os.path.join(root, file_name)
-                    relative_path = os.path.relpath(full_path, path)
-                    
-                    try:
-                        if Config.is_image_file(file_name):
-                            content = "[Image File]"
-                        elif Config.is_pdf_file(file_name):
-                            file_reader.file_path = full_path
-                            content = file_reader.read_pdf_file(full_path)
-                        else:
-                            file_reader.file_path = full_path
-                            try:
-                                content = file_reader.read_text_file(full_path)
-                            except InvalidFileTypeError:
-                                content = "[Binary File]"
-                        
-                        files_content.append(f"--- File: {relative_path} ---\n{content}\n")
-                    except Exception as e:
-                        files_content.append(f"--- File: {relative_path} ---\nError: {str(e)}\n")
+                    full_path = root_prefix + file_name
+                    relative_paths.append(full_path[prefix_len:])
+                    full_paths.append(full_path)
+            
+            # Reads are independent and mostly I/O bound, so overlap them on
+            # the shared pool; map() keeps the walk order
+            if len(full_paths) > 1:
+                contents = _get_io_pool().map(read_context_file, full_paths)
+            else:
+                contents = map(read_context_file, full_paths)
+            files_content.extend(zip(relative_paths, contents))
         else:
             # It's a single file - read it directly
-            try:
-                if Config.is_image_file(name):
-                    content = "[Image File]"
-                elif Config.is_pdf_file(name):
-                    file_reader.file_path = path
-                    content = file_reader.read_pdf_file(path)
-                else:
-                    file_reader.file_path = path
-                    try:
-                        content = file_reader.read_text_file(path)
-                    except InvalidFileTypeError:
-                        content = "[Binary File]"
-                
-                files_content.append(f"--- File: {name} ---\n{content}\n")
-            except Exception as e:
-                files_content.append(f"--- File: {name} ---\nError: {str(e)}\n")
+            files_content.append((name, read_context_file(path)))
                 
         if not files_content:
-            output += "No readable content found."
+            parts.append("No readable content found.")
         else:
-            output += "\n".join(files_content)
+            for index, (label, content) in enumerate(files_content):
+                if index:
+                    parts.append("\n")
+                parts += (f"--- File: {label} ---\n", content, "\n")
             
-        output += "\n=== END OF CONTENT ===\n"
+        parts.append("\n=== END OF CONTENT ===\n")
         
         logger.info(f"Chain: Read latest content '{name}' ({'dir' if is_dir else 'file'})")
-        return output
+        return "".join(parts)
 
     except Exception as e:
         logger.exception("Error in read_latest_content")
@@ -695,6 +1422,6 @@ def list_files_within_folder(folder_name: str) -> str:
 
 if __name__ == "__main__":
     logger.info(f"Starting {Config.SERVER_NAME} MCP server")
-    logger.info(f"Storage path: {Config.STORAGE_PATH}")
+    logger.info(f"Storage path: {Config.storage_path()}")
     logger.info(f"Upload path: {Config.UPLOADED_FILES_PATH}")
     mcp.run()
\ No newline at end of file
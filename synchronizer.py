@@ -6,35 +6,203 @@ to the local storage directory, ensuring that the server always works with
 local copies of files.
 """
 
+import errno
 import os
 import shutil
+import tempfile
 import logging
+from typing import Callable, Iterator, Optional
 from config import Config
 
+import queue
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import (
+    DirCreatedEvent, DirMovedEvent, FileClosedEvent, FileMovedEvent, FileSystemEventHandler
+)
+from watchdog.utils import UnsupportedLibcError, platform
+
+InotifyObserver = None
+if platform.is_linux():
+    try:
+        from watchdog.observers.inotify import InotifyObserver
+    except UnsupportedLibcError:
+        # watchdog's own Observer falls back to polling in this case too
+        pass
 
 logger = logging.getLogger(__name__)
 
+# The only inotify events the sync needs. Passed as the watch's event
+# filter, this also narrows the kernel's inotify mask, so the open, modify
+# and close-nowrite events of every write (and of the sync's own reads of
+# the sources) are never delivered at all.
+_INOTIFY_EVENTS = [FileClosedEvent, FileMovedEvent, DirCreatedEvent, DirMovedEvent]
+
+# copy_file_range errors meaning "not possible for these files" rather than
+# a real I/O failure; the copy then falls back to shutil
+_COPY_RANGE_UNSUPPORTED = frozenset({
+    errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF
+})
+
+
+def _copy_file(source_path: str, dest_path: str):
+    """
+    Copy a file's contents and metadata, like shutil.copy2.
+    
+    On Linux the data is moved with os.copy_file_range, which stays in the
+    kernel and lets filesystems such as btrfs and XFS share extents
+    (reflink) instead of copying bytes. Where it is unavailable, or refused
+    for this pair of files, shutil.copyfile does the copy (itself using
+    sendfile on Linux).
+    
+    The copy is written to a temporary file next to the destination and
+    renamed over it, so readers never see a partial file and memory maps of
+    the previous version (see filereader._open_pdf_reader) stay valid
+    instead of faulting when the old file would have been truncated.
+    
+    Args:
+        source_path: File to copy
+        dest_path: Destination file, created or replaced
+    """
+    dest_dir, dest_name = os.path.split(dest_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{dest_name}.", suffix=".tmp", dir=dest_dir)
+    try:
+        copied = False
+        with open(fd, 'wb') as dst:
+            if hasattr(os, 'copy_file_range'):
+                with open(source_path, 'rb') as src:
+                    size = os.fstat(src.fileno()).st_size
+                    offset = 0
+                    try:
+                        while offset < size:
+                            sent = os.copy_file_range(src.fileno(), dst.fileno(), size - offset)
+                            if sent == 0:
+                                # The file shrank while being copied
+                                break
+                            offset += sent
+                        # A zero size may not mean an empty file (e.g. procfs), so
+                        # those are left to shutil, which reads until EOF
+                        copied = size > 0
+                    except OSError as e:
+                        if offset or e.errno not in _COPY_RANGE_UNSUPPORTED:
+                            raise
+        if not copied:
+            shutil.copyfile(source_path, temp_path)
+        shutil.copystat(source_path, temp_path)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _is_ignored(path: str) -> bool:
+    """
+    Whether a file should never be synced: an in-progress download, an
+    editor temp file, OS metadata, a hidden file, or (when
+    Config.SYNC_ALLOWED_SUFFIXES is set) a type not on the allowlist.
+    """
+    name = os.path.basename(path)
+    suffix = os.path.splitext(name)[1].lower()
+    return (
+        suffix in Config.SYNC_IGNORE_SUFFIXES
+        or name in Config.SYNC_IGNORE_NAMES
+        or name.startswith('.')
+        or name.endswith('~')
+        or (
+            Config.SYNC_ALLOWED_SUFFIXES is not None
+            and suffix not in Config.SYNC_ALLOWED_SUFFIXES
+        )
+    )
+
+def _is_ignored_dir(name: str) -> bool:
+    """Whether a directory is never synced or descended into: hidden, or OS metadata."""
+    return name.startswith('.') or name in Config.SYNC_IGNORE_NAMES
+
+
 class SyncEventHandler(FileSystemEventHandler):
-    """Event handler for watchdog file system events."""
+    """
+    Event handler for watchdog file system events.
+    
+    On Linux the watch only reports closed-after-writing files (see
+    _INOTIFY_EVENTS), so a file is synced once, as soon as its writer closes
+    it. Other observers report a burst of created/modified events per write
+    instead, so those syncs are debounced per path: each event (re)starts a
+    timer and the file is copied once, Config.SYNC_DEBOUNCE_SECONDS after
+    the last event. Renamed files are debounced the same way.
+    
+    Events for ignored paths (see FileSynchronizer.is_ignored) are dropped,
+    so a temporary download is only copied once it is renamed to its final
+    name, and nothing below a hidden or OS metadata directory is synced. A
+    directory that appears is synced as a whole, since files can land in it
+    before the watch covers it (or, when moved in, without any file event).
+    
+    Copies (and the sync of a new directory) are handed to the
+    synchronizer's worker thread, so neither the observer thread nor the
+    debounce timers ever wait on file I/O.
+    """
     
     def __init__(self, synchronizer):
         self.synchronizer = synchronizer
+        self._timers: dict[str, threading.Timer] = {}
+        self._lock = threading.Lock()
         
     def on_created(self, event):
-        if not event.is_directory:
-            self.synchronizer.sync_single_file(event.src_path)
+        if self.synchronizer.is_ignored(event.src_path, event.is_directory):
+            return
+        if event.is_directory:
+            self.synchronizer.enqueue(event.src_path, is_directory=True)
+        else:
+            self._schedule(event.src_path)
             
     def on_modified(self, event):
-        if not event.is_directory:
-            self.synchronizer.sync_single_file(event.src_path)
+        if not event.is_directory and not self.synchronizer.is_ignored(event.src_path):
+            self._schedule(event.src_path)
+    
+    def on_closed(self, event):
+        if not self.synchronizer.is_ignored(event.src_path):
+            self.synchronizer.enqueue(event.src_path)
             
     def on_moved(self, event):
-        if not event.is_directory:
-            self.synchronizer.sync_single_file(event.dest_path)
+        # With full inotify events, a move into or out of a watched
+        # directory leaves the path on the unwatched side empty
+        if not event.dest_path:
+            return
+        if self.synchronizer.is_ignored(event.dest_path, event.is_directory):
+            return
+        if event.is_directory:
+            self.synchronizer.enqueue(event.dest_path, is_directory=True)
+        else:
+            self._schedule(event.dest_path)
+    
+    def _schedule(self, path: str):
+        """Sync path once the events for it have been quiet for the debounce delay."""
+        timer = threading.Timer(Config.SYNC_DEBOUNCE_SECONDS, self._fire, args=(path,))
+        timer.daemon = True
+        with self._lock:
+            previous = self._timers.get(path)
+            if previous is not None:
+                previous.cancel()
+            self._timers[path] = timer
+        timer.start()
+    
+    def _fire(self, path: str):
+        with self._lock:
+            # A newer event may have replaced this timer just as it fired
+            if self._timers.get(path) is not threading.current_thread():
+                return
+            del self._timers[path]
+        self.synchronizer.enqueue(path)
+    
+    def cancel_pending(self):
+        """Cancel all syncs that are still waiting out their debounce delay."""
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
 
 class FileSynchronizer:
     """
@@ -43,8 +211,26 @@ class FileSynchronizer:
     
     def __init__(self):
         self.source_dir = Config.UPLOADED_FILES_PATH
-        self.dest_dir = Config.STORAGE_PATH
+        self.dest_dir = Config.storage_path()
+        # Separator-terminated roots, so paths under the source map onto the
+        # destination by slicing and concatenation (see sync_single_file)
+        self._source_prefix = os.path.join(os.path.normpath(self.source_dir), '')
+        self._dest_prefix = os.path.join(self.dest_dir, '')
+        # Destination directories already created by this process, so
+        # steady-state syncs skip makedirs; set operations are atomic, and
+        # two threads racing to create the same directory is harmless
+        self._known_dirs: set[str] = set()
         self.observer = None
+        self.event_handler = None
+        # Called (from the worker thread) after a file is copied into storage
+        self.on_change: Optional[Callable[[], None]] = None
+        # Syncs waiting for the worker, as (path, is_directory); a key already
+        # in _pending is not queued again, so a burst of events for one path
+        # costs a single copy. None tells the worker to exit.
+        self._queue: queue.Queue = queue.Queue(maxsize=Config.SYNC_QUEUE_MAX)
+        self._pending: set[tuple[str, bool]] = set()
+        self._pending_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
         
     def start_watching(self):
         """Start the background monitoring thread using watchdog."""
@@ -56,14 +242,37 @@ class FileSynchronizer:
             logger.warning(f"Source directory for sync does not exist: {self.source_dir}")
             return
 
+        self.event_handler = SyncEventHandler(self)
+        if InotifyObserver is not None:
+            # Full events, so a file moved in from outside the watched tree comes
+            # through as a move rather than a create (which is filtered out)
+            self.observer = InotifyObserver(generate_full_events=True)
+            event_filter = _INOTIFY_EVENTS
+        else:
+            self.observer = Observer()
+            event_filter = None
+        
         # Perform initial full sync
         logger.info("Performing initial full sync...")
-        self.sync_all_files()
-            
-        event_handler = SyncEventHandler(self)
-        self.observer = Observer()
-        self.observer.schedule(event_handler, self.source_dir, recursive=True)
-        self.observer.start()
+        self._sync_tree(self.source_dir)
+        # One recursive watch: on Linux that is a single inotify instance
+        # holding a kernel watch per directory
+        try:
+            self.observer.schedule(
+                self.event_handler, self.source_dir, recursive=True, event_filter=event_filter
+            )
+            # The inotify instance is only created as the emitter starts
+            self.observer.start()
+        except OSError as e:
+            # e.g. fs.inotify.max_user_watches exceeded; the server still
+            # starts, with the uploads synced only this once
+            logger.error(f"Cannot watch {self.source_dir}, changes will not be synced: {e}")
+            self.observer = None
+            self.event_handler = None
+            return
+        # Events queued before this point simply wait for the worker
+        self._worker = threading.Thread(target=self._run_worker, name="sync-worker", daemon=True)
+        self._worker.start()
         logger.info(f"Started watchdog file synchronizer on {self.source_dir}")
         
     def stop_watching(self):
@@ -74,49 +283,255 @@ class FileSynchronizer:
         self.observer.stop()
         self.observer.join()
         self.observer = None
+        self.event_handler.cancel_pending()
+        self.event_handler = None
+        # Let the worker finish what is already queued, then exit
+        self._queue.put(None)
+        self._worker.join()
+        self._worker = None
         logger.info("Stopped watchdog file synchronizer")
 
-    def sync_single_file(self, source_path: str):
-        """Sync a single file from source to destination."""
+    def enqueue(self, path: str, is_directory: bool = False):
+        """
+        Queue a file (or a new directory) for the worker thread to sync.
+        
+        Does nothing if the same path is already waiting. When
+        Config.SYNC_QUEUE_MAX syncs are pending the caller blocks until the
+        worker catches up, rather than the event being dropped.
+        
+        Args:
+            path: File or directory under the source directory
+            is_directory: Whether path is a directory to add_directory()
+        """
+        key = (path, is_directory)
+        with self._pending_lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._queue.put(key)
+    
+    def _run_worker(self):
+        """Sync queued paths one at a time until stop_watching() sends None."""
+        while True:
+            key = self._queue.get()
+            if key is None:
+                return
+            with self._pending_lock:
+                # Discarded before the copy, so an event arriving during it
+                # queues the path again instead of being lost
+                self._pending.discard(key)
+            path, is_directory = key
+            try:
+                if is_directory:
+                    self.add_directory(path)
+                else:
+                    self.sync_single_file(path)
+            except Exception as e:
+                logger.error(f"Sync worker failed on {path}: {e}")
+    
+    def is_ignored(self, path: str, is_directory: bool = False) -> bool:
+        """
+        Whether a path under the source directory is never synced.
+        
+        That is the case for ignored files (_is_ignored), ignored
+        directories (_is_ignored_dir), and anything below an ignored
+        directory.
+        
+        Args:
+            path: File or directory under the source directory
+            is_directory: Whether path is a directory
+            
+        Returns:
+            True if the path should be skipped
+        """
+        if path.startswith(self._source_prefix):
+            rel_path = path[len(self._source_prefix):]
+        else:
+            rel_path = os.path.relpath(path, self.source_dir)
+        if rel_path in ('', os.curdir):
+            # The source directory itself
+            return False
+        *parents, name = rel_path.split(os.sep)
+        if any(_is_ignored_dir(parent) for parent in parents):
+            return True
+        return _is_ignored_dir(name) if is_directory else _is_ignored(name)
+    
+    def add_directory(self, path: str):
+        """
+        Sync a directory that appeared in the source.
+        
+        Files may have been written into it before the watch covered it, or
+        moved in along with it, so its current contents are synced.
+        
+        Args:
+            path: New directory under the source directory
+        """
+        if not self.is_ignored(path, is_directory=True):
+            self._sync_tree(path)
+    
+    def sync_single_file(
+        self,
+        source_path: str,
+        source_stat: Optional[os.stat_result] = None
+    ) -> bool:
+        """
+        Sync a single file from source to destination.
+        
+        copy2 carries the source's mtime over to the copy, so a destination
+        with the same size and st_mtime_ns is taken as already in sync and
+        is not rewritten.
+        
+        Event and scan paths start with the source directory, so the
+        destination is found by swapping that prefix (falling back to
+        relpath otherwise). Files directly in the source directory, the
+        usual case for uploads, need no makedirs: the destination root is
+        created by the initial sync.
+        
+        Args:
+            source_path: File under the source directory
+            source_stat: os.stat() of source_path, if the caller already has it
+            
+        Returns:
+            True if the file was copied, False if it was up to date or failed
+        """
         try:
             # Calculate relative path
-            rel_path = os.path.relpath(source_path, self.source_dir)
-            dest_path = os.path.join(self.dest_dir, rel_path)
+            if source_path.startswith(self._source_prefix):
+                rel_path = source_path[len(self._source_prefix):]
+            else:
+                rel_path = os.path.relpath(source_path, self.source_dir)
+            dest_path = self._dest_prefix + rel_path
+            
+            if source_stat is None:
+                source_stat = os.stat(source_path)
+            try:
+                dest_stat = os.stat(dest_path)
+            except FileNotFoundError:
+                dest_stat = None
+            if (
+                dest_stat is not None
+                and dest_stat.st_size == source_stat.st_size
+                and dest_stat.st_mtime_ns == source_stat.st_mtime_ns
+            ):
+                logger.debug("Up to date: %s", dest_path)
+                return False
             
-            # Ensure dest directory exists
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            # Ensure dest directory exists (the root always does)
+            dest_parent = os.path.dirname(dest_path) if os.sep in rel_path else None
+            if dest_parent is not None:
+                self._ensure_directory(dest_parent)
             
             # Copy file with metadata
-            shutil.copy2(source_path, dest_path)
+            try:
+                _copy_file(source_path, dest_path)
+            except FileNotFoundError:
+                if dest_parent is None or os.path.isdir(dest_parent):
+                    raise
+                # Removed from storage since it was created; make it again
+                self._known_dirs.discard(dest_parent)
+                self._ensure_directory(dest_parent)
+                _copy_file(source_path, dest_path)
             logger.info(f"Synced: {source_path} -> {dest_path}")
+            if self.on_change is not None:
+                self.on_change()
+            return True
             
         except Exception as e:
             logger.error(f"Failed to sync file {source_path}: {e}")
+            return False
 
+    def _ensure_directory(self, path: str):
+        """Create a destination directory unless this process already has."""
+        if path not in self._known_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._known_dirs.add(path)
+    
+    def _iter_files(self, source_root: str) -> Iterator[os.DirEntry]:
+        """
+        Yield the files below a source directory, creating each directory's
+        counterpart in the destination as it is visited.
+        
+        Uses os.scandir with an explicit stack, so entries are classified from
+        the readdir file type without a stat each. Like os.walk, symlinked
+        directories are not descended into and unreadable ones are skipped;
+        ignored directories (_is_ignored_dir) are not descended into either.
+        
+        Args:
+            source_root: Directory under (or equal to) the source directory
+        
+        Yields:
+            DirEntry of each file
+        """
+        # (source directory, matching destination directory)
+        rel_root = os.path.relpath(source_root, self.source_dir)
+        stack = [(source_root, os.path.normpath(os.path.join(self.dest_dir, rel_root)))]
+        while stack:
+            source_root, dest_root = stack.pop()
+            self._ensure_directory(dest_root)
+            try:
+                with os.scandir(source_root) as it:
+                    entries = list(it)
+            except OSError as e:
+                # Skipped like os.walk does, so one bad directory does not
+                # stop the rest of the sync
+                logger.warning(f"Cannot scan {source_root}: {e}")
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink() and not _is_ignored_dir(entry.name):
+                        stack.append((entry.path, os.path.join(dest_root, entry.name)))
+                elif entry.is_file():
+                    yield entry
+    
     def sync_all_files(self) -> int:
         """
         Synchronize all files from source to destination (full scan).
+        
+        Returns:
+            Number of files copied; files already up to date are not counted
         """
-        if not os.path.exists(self.source_dir):
+        return self._sync_tree(self.source_dir)
+    
+    def _sync_tree(self, source_root: str) -> int:
+        """
+        Synchronize all files below one source directory.
+        
+        Args:
+            source_root: Directory under (or equal to) the source directory
+            
+        Returns:
+            Number of files copied; files already up to date are not counted
+        """
+        if not os.path.exists(source_root):
             return 0
             
-        synced_count = 0
-        
         try:
-            # Walk through source directory
-            for root, dirs, files in os.walk(self.source_dir):
-                # Calculate relative path from source root
-                rel_path = os.path.relpath(root, self.source_dir)
-                
-                # Create corresponding directory in destination
-                dest_root = os.path.join(self.dest_dir, rel_path)
-                if not os.path.exists(dest_root):
-                    os.makedirs(dest_root)
-                
-                for file_name in files:
-                    source_file = os.path.join(root, file_name)
-                    self.sync_single_file(source_file)
-                    synced_count += 1
+            # Walk through source directory, creating the destination
+            # directories up front so the copies never race on makedirs
+            source_files = []
+            source_stats = []
+            for entry in self._iter_files(source_root):
+                if _is_ignored(entry.path):
+                    continue
+                # A file removed mid-walk just drops out of this sync
+                try:
+                    entry_stat = entry.stat()
+                except OSError:
+                    continue
+                source_files.append(entry.path)
+                source_stats.append(entry_stat)
+            
+            # Copies are independent and I/O bound, so overlap them
+            if len(source_files) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=Config.IO_MAX_WORKERS,
+                    thread_name_prefix="sync"
+                ) as pool:
+                    synced_count = sum(
+                        pool.map(self.sync_single_file, source_files, source_stats)
+                    )
+            else:
+                synced_count = sum(map(self.sync_single_file, source_files, source_stats))
                             
             if synced_count > 0:
                 logger.info(f"Full synchronization complete. Synced {synced_count} files.")
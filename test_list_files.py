@@ -1,3 +1,7 @@
+import os
+import shutil
+import tempfile
+
 from main import list_files
 
 # Test with a non-existent directory
@@ -7,3 +11,30 @@ print(f"Result for non-existent directory: {result}")
 # Test with a valid directory (current directory)
 result_valid = list_files(".")
 print(f"Result for valid directory: {result_valid}")
+
+# Test that a cached listing is refreshed once a directory's mtime changes
+root = tempfile.mkdtemp(prefix="list-files-test-")
+try:
+    os.makedirs(os.path.join(root, "older"))
+    os.makedirs(os.path.join(root, "newer"))
+    open(os.path.join(root, "newer", "a.txt"), "w").close()
+    os.utime(os.path.join(root, "older"), (1_000_000, 1_000_000))
+
+    first = list_files(root)
+    assert list_files(root) == first, "expected the cached output for an unchanged tree"
+    assert "newer [MOST RECENT]" in first
+
+    # A new file changes its directory's mtime, so it must appear
+    open(os.path.join(root, "newer", "b.txt"), "w").close()
+    after_add = list_files(root)
+    print(f"Result after adding a file: {after_add}")
+    assert "Files: a.txt, b.txt" in after_add, "expected the new file in the listing"
+
+    # Bumping a subdirectory's mtime makes it the most recent one
+    os.utime(os.path.join(root, "older"))
+    after_touch = list_files(root)
+    print(f"Result after touching a directory: {after_touch}")
+    assert "older [MOST RECENT]" in after_touch, "expected the touched directory to be most recent"
+    assert after_touch != after_add
+finally:
+    shutil.rmtree(root)
@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+import time
+
+from config import Config
+from main import find_file_in_paths, invalidate_search_cache
+
+root = tempfile.mkdtemp(prefix="search-test-")
+search_paths = (root,)
+
+def touch(*parts):
+    path = os.path.join(root, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "w").close()
+    return path
+
+try:
+    # Test 1: an exact name deeper in the tree beats a partial match found first
+    print("--- Test 1: Exact match over partial match ---")
+    partial = touch("my_report.txt")
+    exact = touch("sub", "report.txt")
+    result = find_file_in_paths("report.txt", search_paths)
+    print(f"Result: {result}")
+    assert result == exact, f"expected {exact}"
+
+    # Test 2: a cached hit is kept until the cache is invalidated
+    print("\n--- Test 2: New file found after invalidate_search_cache ---")
+    old = touch("old_notes.md")
+    result = find_file_in_paths("notes.md", search_paths)
+    print(f"Before: {result}")
+    assert result == old
+    new = touch("docs", "notes.md")
+    result = find_file_in_paths("notes.md", search_paths)
+    print(f"Cached: {result}")
+    assert result == old, "expected the cached hit within the TTL"
+    invalidate_search_cache()
+    result = find_file_in_paths("notes.md", search_paths)
+    print(f"After invalidate: {result}")
+    assert result == new, f"expected {new}"
+
+    # Test 3: a cached hit expires after Config.SEARCH_CACHE_TTL
+    print("\n--- Test 3: Cached result expires ---")
+    Config.SEARCH_CACHE_TTL = 0.2
+    old = touch("draft_plan.txt")
+    result = find_file_in_paths("plan.txt", search_paths)
+    print(f"Before: {result}")
+    assert result == old
+    new = touch("final", "plan.txt")
+    result = find_file_in_paths("plan.txt", search_paths)
+    print(f"Cached: {result}")
+    assert result == old, "expected the cached hit within the TTL"
+    time.sleep(0.3)
+    result = find_file_in_paths("plan.txt", search_paths)
+    print(f"After TTL: {result}")
+    assert result == new, f"expected {new}"
+
+    print("\nAll search tests passed")
+finally:
+    shutil.rmtree(root)